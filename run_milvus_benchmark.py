@@ -3,32 +3,97 @@
 
 import os
 import argparse
+import json
 import subprocess
 import sys
 import time
 import logging
-from scripts.start_milvus import start_milvus, stop_milvus, check_docker
 from scripts.logger import setup_logger
 from scripts.check_environment import check_system_resources, check_python_version, check_dependencies
+from scripts import check_environment, explain_results
+
+# scripts.start_milvus（docker SDK）、scripts.download_data（requests/sklearn）和
+# scripts.run_benchmark（pymilvus/pandas/matplotlib）在对应步骤内延迟导入，
+# 使--check-env/--analyze-only路径不承担这些重量级依赖的导入开销
 
 # 设置日志记录器
 logger = setup_logger('milvus_benchmark')
 
-def run_command(command, description=None):
-    """运行命令并显示状态"""
+# 结果目录，导入时计算一次供全模块使用
+_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# 环境检查缓存有效期（秒），连续多次运行时跳过重复检查
+ENV_CACHE_TTL = 600
+
+def _requirements_mtime():
+    """获取requirements.txt的修改时间，文件不存在时返回None"""
+    try:
+        return os.path.getmtime('requirements.txt')
+    except OSError:
+        return None
+
+def load_env_cache(cache_file):
+    """读取环境检查缓存；过期、requirements.txt变更或上次未通过时返回None"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - cache.get("timestamp", 0) >= ENV_CACHE_TTL:
+        return None
+    if cache.get("requirements_mtime") != _requirements_mtime():
+        return None
+    if cache.get("overall") != "通过":
+        return None
+    return cache
+
+def save_env_cache(cache_file):
+    """在基本环境检查通过后写入缓存"""
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "timestamp": time.time(),
+                "requirements_mtime": _requirements_mtime(),
+                "overall": "通过"
+            }, f)
+    except OSError as e:
+        logger.debug(f"写入环境检查缓存失败: {e}")
+
+def install_requirements(description=None):
+    """通过pip安装项目依赖"""
     if description:
         logger.info(f"{description}")
-    
+
     try:
-        process = subprocess.run(command, shell=True, check=True, text=True)
-        if process.returncode == 0:
+        # stdout=None让子进程直接继承终端FD，进度输出实时渲染且父进程不做任何缓冲
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pip", "install",
+             "--disable-pip-version-check", "--no-input",
+             "-r", "requirements.txt"],
+            stdout=None, stderr=subprocess.STDOUT
+        )
+        returncode = process.wait()
+        if returncode == 0:
             return True
         else:
-            logger.error(f"命令执行失败，返回代码: {process.returncode}")
+            logger.error(f"命令执行失败，返回代码: {returncode}")
             return False
-    except subprocess.CalledProcessError as e:
-        logger.error(f"命令执行错误: {e}")
+    except Exception as e:
+        logger.error(f"发生异常: {e}")
         return False
+
+def run_step(func, args_namespace, description=None):
+    """在当前进程中执行脚本步骤，复用已导入的重量级依赖"""
+    if description:
+        logger.info(f"{description}")
+
+    try:
+        result = func(args_namespace)
+        if result is False:
+            logger.error(f"步骤执行失败: {description}")
+            return False
+        return True
     except Exception as e:
         logger.error(f"发生异常: {e}")
         return False
@@ -41,76 +106,89 @@ def main():
     )
     parser.add_argument('--skip-download', action='store_true', help='跳过数据下载步骤')
     parser.add_argument('--skip-milvus', action='store_true', help='跳过Milvus启动步骤')
-    parser.add_argument('--indices', type=str, nargs='+', 
-                        choices=['FLAT', 'IVF_FLAT', 'IVF_SQ8', 'HNSW'],
+    parser.add_argument('--keep-milvus', action='store_true', help='测试结束后保留Milvus服务，便于连续多次运行')
+    parser.add_argument('--indices', type=str, nargs='+',
+                        choices=['FLAT', 'IVF_FLAT', 'IVF_SQ8', 'HNSW', 'IVF_PQ'],
                         help='要测试的索引类型，如不指定则测试所有索引')
     parser.add_argument('--fast-test', action='store_true', help='仅测试FLAT索引，用于快速验证')
     parser.add_argument('--check-env', action='store_true', help='仅检查环境，不运行测试')
     parser.add_argument('--analyze-only', action='store_true', help='仅分析已有结果，不运行测试')
     parser.add_argument('--verbose', action='store_true', help='显示详细日志')
-    
+
     args = parser.parse_args()
-    
+
     # 设置日志级别
     if args.verbose:
         logger.setLevel(logging.DEBUG)
-    
+
     # 创建结果目录
-    results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+    results_dir = _RESULTS_DIR
     os.makedirs(results_dir, exist_ok=True)
-    
+
     # 如果仅检查环境
     if args.check_env:
         logger.info("执行环境检查...")
-        cmd = f"python scripts/check_environment.py --output-dir {results_dir}"
-        if args.verbose:
-            cmd += " --verbose"
-        return run_command(cmd, "检查环境")
-    
+        # host/port传None，由check_milvus_connection自己套用
+        # MILVUS_HOST/MILVUS_PORT环境变量的默认值
+        env_args = argparse.Namespace(
+            output_dir=results_dir, verbose=args.verbose,
+            milvus_host=None, milvus_port=None
+        )
+        return check_environment.run(env_args) == 0
+
     # 如果仅分析已有结果
     if args.analyze_only:
         logger.info("分析已有测试结果...")
-        cmd = f"python scripts/explain_results.py --results-dir {results_dir} --output-dir {results_dir}"
-        if args.verbose:
-            cmd += " --verbose"
-        return run_command(cmd, "分析结果")
-    
-    # 检查项目依赖
-    logger.info("检查项目依赖...")
-    if not run_command("pip install -r requirements.txt", "安装项目依赖"):
-        return
-    
-    # 简单环境检查
-    logger.info("执行基本环境检查...")
-    python_ok, _ = check_python_version()
-    if not python_ok:
-        logger.warning("Python版本较低，可能影响性能")
-    
-    deps_ok, deps_details = check_dependencies()
-    if not deps_ok:
-        logger.warning(f"缺少依赖项: {', '.join(deps_details['missing_packages'])}")
-        if not run_command("pip install -r requirements.txt", "尝试安装缺失的依赖"):
-            return
-    
-    # 检查系统资源
-    resources_ok, resources = check_system_resources()
-    if not resources_ok:
-        logger.warning("系统资源不满足最低要求，可能影响性能")
-        logger.info(f"可用内存: {resources['memory']['available_gb']} GB (建议至少4GB)")
-        logger.info(f"可用磁盘空间: {resources['disk']['free_gb']} GB (建议至少10GB)")
-    
+        analyze_args = argparse.Namespace(
+            results_dir=results_dir, output_dir=results_dir, verbose=args.verbose
+        )
+        return run_step(explain_results.run, analyze_args, "分析结果")
+
+    # 简单环境检查，近期已通过的检查直接复用缓存结果
+    env_cache_file = os.path.join(results_dir, '.env_cache.json')
+    if load_env_cache(env_cache_file):
+        logger.info("环境检查缓存命中，跳过基本环境检查")
+    else:
+        logger.info("执行基本环境检查...")
+        python_ok, _ = check_python_version()
+        if not python_ok:
+            logger.warning("Python版本较低，可能影响性能")
+
+        # 先检查依赖，仅在缺失时才调用pip，避免热环境下无谓的解析开销
+        logger.info("检查项目依赖...")
+        deps_ok, deps_details = check_dependencies()
+        if not deps_ok:
+            logger.warning(f"缺少依赖项: {', '.join(deps_details['missing_packages'])}")
+            if not install_requirements("尝试安装缺失的依赖"):
+                return
+
+        # 检查系统资源
+        resources_ok, resources = check_system_resources()
+        if not resources_ok:
+            logger.warning("系统资源不满足最低要求，可能影响性能")
+            logger.info(f"可用内存: {resources['memory']['available_gb']} GB (建议至少4GB)")
+            logger.info(f"可用磁盘空间: {resources['disk']['free_gb']} GB (建议至少10GB)")
+
+        if python_ok and deps_ok and resources_ok:
+            save_env_cache(env_cache_file)
+
     # 检查Docker可用性
-    if not args.skip_milvus and not check_docker():
-        logger.error("Docker不可用，无法启动Milvus服务")
-        return
-    
+    if not args.skip_milvus:
+        from scripts.start_milvus import start_milvus, stop_milvus, check_docker
+
+        if not check_docker():
+            logger.error("Docker不可用，无法启动Milvus服务")
+            return
+
     # 步骤1：下载数据集
     if not args.skip_download:
-        if not run_command("python scripts/download_data.py", "下载SIFT数据集"):
+        from scripts import download_data
+
+        if not run_step(download_data.run, None, "下载SIFT数据集"):
             return
     else:
         logger.info("跳过数据下载步骤")
-    
+
     # 步骤2：启动Milvus服务
     if not args.skip_milvus:
         logger.info("启动Milvus服务")
@@ -119,40 +197,40 @@ def main():
             return
     else:
         logger.info("跳过Milvus启动步骤")
-    
+
     # 步骤3：运行性能基准测试
-    benchmark_cmd = "python scripts/run_benchmark.py"
-    
     # 如果指定了快速测试，只测试FLAT索引
     if args.fast_test:
-        benchmark_cmd += " --indices FLAT"
+        indices = ['FLAT']
     # 否则使用命令行参数指定的索引
-    elif args.indices:
-        indices_str = " ".join(args.indices)
-        benchmark_cmd += f" --indices {indices_str}"
-    
-    # 添加详细日志选项
-    if args.verbose:
-        benchmark_cmd += " --verbose"
-    
+    else:
+        indices = args.indices
+
+    benchmark_args = argparse.Namespace(indices=indices, verbose=args.verbose)
+
+    from scripts import run_benchmark
+
     try:
-        if not run_command(benchmark_cmd, "运行性能基准测试"):
+        if not run_step(run_benchmark.run, benchmark_args, "运行性能基准测试"):
             logger.error("性能基准测试失败")
     finally:
-        # 停止Milvus服务
+        # 停止Milvus服务，--keep-milvus时保留以便下次运行直接复用
         if not args.skip_milvus:
-            logger.info("停止Milvus服务")
-            stop_milvus()
-    
+            if args.keep_milvus:
+                logger.info("保留Milvus服务（--keep-milvus）")
+            else:
+                logger.info("停止Milvus服务")
+                stop_milvus()
+
     # 步骤4：分析结果
     logger.info("分析测试结果...")
-    analyze_cmd = f"python scripts/explain_results.py --results-dir {results_dir} --output-dir {results_dir}"
-    if args.verbose:
-        analyze_cmd += " --verbose"
-    run_command(analyze_cmd, "分析结果")
-    
+    analyze_args = argparse.Namespace(
+        results_dir=results_dir, output_dir=results_dir, verbose=args.verbose
+    )
+    run_step(explain_results.run, analyze_args, "分析结果")
+
     logger.info("实验完成！")
     logger.info(f"结果保存在 {results_dir} 目录中")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
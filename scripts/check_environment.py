@@ -3,23 +3,49 @@
 
 import os
 import sys
+import argparse
 import platform
 import subprocess
-import psutil
-import importlib.util
-import socket
 import time
+import threading
+from importlib.metadata import PackageNotFoundError, version as package_version
+
+# orjson对嵌套字典的序列化比标准库快5-10倍，可用时优先使用
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import json
+import concurrent.futures
 from datetime import datetime
 import logging
 
+# 项目根目录和数据目录，导入时计算一次供全模块使用
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DATA_DIR = os.path.join(_BASE_DIR, 'data')
+
 # 添加项目根目录到路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(_BASE_DIR)
 from scripts.logger import setup_logger
 
 # 设置日志
 logger = setup_logger('env_checker')
 
+# psutil延迟加载，避免--analyze-only等不需要资源检查的路径承担导入开销
+_psutil = None
+_psutil_primed_at = 0.0
+
+def _get_psutil():
+    """首次使用时导入psutil并预热CPU采样，之后复用同一模块对象"""
+    global _psutil, _psutil_primed_at
+    if _psutil is None:
+        import psutil
+        # 预热CPU使用率采样，使后续interval=None的调用可以直接读取差值而不阻塞
+        psutil.cpu_percent(interval=None)
+        _psutil_primed_at = time.monotonic()
+        _psutil = psutil
+    return _psutil
+
 def check_python_version():
     """检查Python版本"""
     version = sys.version_info
@@ -44,26 +70,20 @@ def check_dependencies():
         "docker",
         "psutil"
     ]
-    
+
     missing_packages = []
     installed_packages = {}
-    
+
     for package in required_packages:
-        spec = importlib.util.find_spec(package)
-        if spec is None:
+        # 只读取.dist-info元数据获取版本号，不导入包本身，省去C扩展的加载开销
+        try:
+            version = package_version(package)
+            installed_packages[package] = version
+            logger.info(f"依赖项 {package} 已安装，版本: {version}")
+        except PackageNotFoundError:
             logger.warning(f"依赖项 {package} 未安装")
             missing_packages.append(package)
-        else:
-            try:
-                # 尝试获取版本号
-                module = importlib.import_module(package)
-                version = getattr(module, "__version__", "未知")
-                installed_packages[package] = version
-                logger.info(f"依赖项 {package} 已安装，版本: {version}")
-            except Exception as e:
-                logger.warning(f"无法获取 {package} 的版本信息: {e}")
-                installed_packages[package] = "已安装，版本未知"
-    
+
     return len(missing_packages) == 0, {
         "missing_packages": missing_packages,
         "installed_packages": installed_packages
@@ -77,95 +97,111 @@ def check_docker():
         "api_version": "未知",
         "running": False
     }
-    
-    # 检查docker命令是否可用
+
+    # 优先通过Docker SDK直接访问守护进程，一次查询即可获得版本和运行状态
     try:
-        result = subprocess.run(["docker", "--version"], capture_output=True, text=True)
-        if result.returncode == 0:
+        import docker as docker_sdk
+
+        client = docker_sdk.from_env(timeout=3)
+        version = client.version()
+        docker_info["installed"] = True
+        docker_info["running"] = True
+        docker_info["version"] = version.get("Version", "未知")
+        docker_info["api_version"] = version.get("ApiVersion", "未知")
+        logger.info(f"Docker版本: {docker_info['version']} (API {docker_info['api_version']})")
+        logger.info("Docker服务正在运行")
+    except ImportError:
+        # SDK不可用时回退到单次CLI调用；check_output一次性返回字节只解码一遍，
+        # 并丢弃stderr管道，timeout防止守护进程挂起时卡死脚本
+        try:
+            out = subprocess.check_output(
+                ["docker", "version", "--format", "{{json .}}"],
+                stderr=subprocess.DEVNULL, timeout=2
+            ).decode()
+
+            version = json.loads(out)
             docker_info["installed"] = True
-            version_output = result.stdout.strip()
-            logger.info(f"Docker版本信息: {version_output}")
-            
-            # 提取版本号
-            import re
-            match = re.search(r"Docker version ([0-9.]+)", version_output)
-            if match:
-                docker_info["version"] = match.group(1)
-        else:
-            logger.warning("Docker命令不可用")
-            return False, docker_info
-    except Exception as e:
-        logger.error(f"检查Docker版本时出错: {e}")
-        return False, docker_info
-    
-    # 检查Docker是否正在运行
-    try:
-        result = subprocess.run(["docker", "info"], capture_output=True, text=True)
-        if result.returncode == 0:
             docker_info["running"] = True
+            docker_info["version"] = version.get("Client", {}).get("Version", "未知")
+            docker_info["api_version"] = version.get("Server", {}).get("ApiVersion", "未知")
+            logger.info(f"Docker版本: {docker_info['version']} (API {docker_info['api_version']})")
             logger.info("Docker服务正在运行")
-            
-            # 尝试提取API版本
-            api_match = re.search(r"API version:\s+([0-9.]+)", result.stdout)
-            if api_match:
-                docker_info["api_version"] = api_match.group(1)
-        else:
-            logger.warning("Docker服务未运行")
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+            logger.warning("Docker命令不可用或服务未运行")
+            return False, docker_info
+        except Exception as e:
+            logger.error(f"检查Docker状态时出错: {e}")
             return False, docker_info
     except Exception as e:
         logger.error(f"检查Docker状态时出错: {e}")
         return False, docker_info
-    
+
     # 检查docker-compose命令
     try:
         # 先尝试新版命令格式
-        result = subprocess.run(["docker", "compose", "version"], capture_output=True, text=True)
-        if result.returncode == 0:
+        try:
+            subprocess.check_output(["docker", "compose", "version", "--short"],
+                                    stderr=subprocess.DEVNULL, timeout=2)
             docker_info["compose_version"] = "新版格式可用"
             logger.info("Docker Compose (新版格式) 可用")
-        else:
+        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
             # 尝试旧版命令格式
-            result = subprocess.run(["docker-compose", "--version"], capture_output=True, text=True)
-            if result.returncode == 0:
+            try:
+                subprocess.check_output(["docker-compose", "--version"],
+                                        stderr=subprocess.DEVNULL, timeout=2)
                 docker_info["compose_version"] = "旧版格式可用"
                 logger.info("Docker Compose (旧版格式) 可用")
-            else:
+            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
                 docker_info["compose_version"] = "不可用"
                 logger.warning("Docker Compose 不可用")
     except Exception as e:
         docker_info["compose_version"] = "检查失败"
         logger.error(f"检查Docker Compose时出错: {e}")
-    
+
     return docker_info["installed"] and docker_info["running"], docker_info
 
 def check_system_resources():
     """检查系统资源"""
+    psutil = _get_psutil()
+
+    # 每类资源只做一次系统调用，避免重复采样
+    vm = psutil.virtual_memory()
+    du = psutil.disk_usage('/')
+
+    # 差值式读取要求预热与读取之间有真实的时间窗口；
+    # 预热刚刚发生时改用0.1秒的短阻塞采样，否则读数恒为0.0%
+    if time.monotonic() - _psutil_primed_at < 0.1:
+        cpu_usage = psutil.cpu_percent(interval=0.1)
+    else:
+        cpu_usage = psutil.cpu_percent(interval=None)
+
     resources = {
         "cpu": {
             "count": psutil.cpu_count(logical=True),
-            "usage": psutil.cpu_percent(interval=1)
+            "usage": cpu_usage
         },
         "memory": {
-            "total_gb": round(psutil.virtual_memory().total / (1024**3), 2),
-            "available_gb": round(psutil.virtual_memory().available / (1024**3), 2),
-            "percent_used": psutil.virtual_memory().percent
+            "total_gb": round(vm.total / (1024**3), 2),
+            "available_gb": round(vm.available / (1024**3), 2),
+            "percent_used": vm.percent
         },
         "disk": {
-            "total_gb": round(psutil.disk_usage('/').total / (1024**3), 2),
-            "free_gb": round(psutil.disk_usage('/').free / (1024**3), 2),
-            "percent_used": psutil.disk_usage('/').percent
+            "total_gb": round(du.total / (1024**3), 2),
+            "free_gb": round(du.free / (1024**3), 2),
+            "percent_used": du.percent
         }
     }
     
-    # 记录资源信息
-    logger.info(f"CPU核心数: {resources['cpu']['count']}")
-    logger.info(f"CPU使用率: {resources['cpu']['usage']}%")
-    logger.info(f"总内存: {resources['memory']['total_gb']} GB")
-    logger.info(f"可用内存: {resources['memory']['available_gb']} GB")
-    logger.info(f"内存使用率: {resources['memory']['percent_used']}%")
-    logger.info(f"磁盘总空间: {resources['disk']['total_gb']} GB")
-    logger.info(f"磁盘可用空间: {resources['disk']['free_gb']} GB")
-    logger.info(f"磁盘使用率: {resources['disk']['percent_used']}%")
+    # 记录资源信息，合并为一条日志，减少加锁和刷盘次数；%s延迟格式化在级别被过滤时不构造字符串
+    logger.info(
+        "系统资源: CPU核心数=%d 使用率=%.1f%% | 内存 可用/总量=%.2f/%.2fGB 使用率=%.1f%% | "
+        "磁盘 可用/总量=%.2f/%.2fGB 使用率=%.1f%%",
+        resources['cpu']['count'], resources['cpu']['usage'],
+        resources['memory']['available_gb'], resources['memory']['total_gb'],
+        resources['memory']['percent_used'],
+        resources['disk']['free_gb'], resources['disk']['total_gb'],
+        resources['disk']['percent_used']
+    )
     
     # 检查资源是否满足要求
     meets_requirements = True
@@ -187,50 +223,44 @@ def check_system_resources():
     
     return meets_requirements, resources
 
-def check_milvus_connection(host="localhost", port="19530"):
-    """检查Milvus连接"""
+# 环境检查建立的Milvus连接别名，保持打开供后续基准测试复用，避免重复gRPC握手
+_MILVUS_ALIAS = "default"
+
+def check_milvus_connection(host=None, port=None):
+    """检查Milvus连接，默认从MILVUS_HOST/MILVUS_PORT环境变量取地址"""
+    if host is None:
+        host = os.environ.get('MILVUS_HOST', 'localhost')
+    if port is None:
+        port = os.environ.get('MILVUS_PORT', '19530')
+
     connection_info = {
         "host": host,
         "port": port,
         "connected": False,
         "version": "未知"
     }
-    
-    # 首先检查端口是否开放
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        result = sock.connect_ex((host, int(port)))
-        sock.close()
-        
-        if result != 0:
-            logger.warning(f"Milvus端口 {port} 未开放")
-            return False, connection_info
-    except Exception as e:
-        logger.error(f"检查Milvus端口时出错: {e}")
-        return False, connection_info
-    
+
     # 尝试导入pymilvus
     try:
         from pymilvus import connections
-        
-        # 尝试连接
-        connections.connect("default", host=host, port=port, timeout=5.0)
+
+        # gRPC客户端在端口关闭时会快速失败，无需额外的socket探测；
+        # 可达的Milvus握手在50ms内完成，1秒超时足够且限制了不可达主机的等待时间
+        if not connections.has_connection(_MILVUS_ALIAS):
+            connections.connect(_MILVUS_ALIAS, host=host, port=port, timeout=1.0)
         connection_info["connected"] = True
         logger.info("Milvus连接成功")
-        
+
         # 尝试获取版本信息
         try:
             from pymilvus import utility
-            version_info = utility.get_server_version()
+            version_info = utility.get_server_version(using=_MILVUS_ALIAS)
             connection_info["version"] = version_info
             logger.info(f"Milvus版本: {version_info}")
         except Exception as e:
             logger.warning(f"无法获取Milvus版本信息: {e}")
-        
-        # 断开连接
-        connections.disconnect("default")
-        
+
+        # 连接保持打开，供同进程内的后续步骤直接复用
         return True, connection_info
     except ImportError:
         logger.error("未安装pymilvus库，无法连接Milvus")
@@ -241,41 +271,45 @@ def check_milvus_connection(host="localhost", port="19530"):
 
 def check_data_directory():
     """检查数据目录"""
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_dir = os.path.join(base_dir, 'data')
-    
+    data_dir = _DATA_DIR
+
     data_info = {
         "exists": os.path.exists(data_dir),
         "files": [],
+        "file_count": 0,
         "total_size_mb": 0
     }
-    
+
     if data_info["exists"]:
         logger.info(f"数据目录存在: {data_dir}")
-        
-        # 列出数据文件
-        for filename in os.listdir(data_dir):
-            file_path = os.path.join(data_dir, filename)
-            if os.path.isfile(file_path):
-                size_mb = os.path.getsize(file_path) / (1024 * 1024)
-                data_info["files"].append({
-                    "name": filename,
-                    "size_mb": round(size_mb, 2)
-                })
-                data_info["total_size_mb"] += size_mb
-        
-        data_info["total_size_mb"] = round(data_info["total_size_mb"], 2)
-        
-        if data_info["files"]:
-            logger.info(f"数据目录中有 {len(data_info['files'])} 个文件，总大小: {data_info['total_size_mb']} MB")
+
+        # 列出数据文件，scandir的DirEntry.stat()复用目录读取时缓存的元数据，
+        # 每个文件只需一次系统调用而不是三次；总大小按原始字节累加，最后只除一次
+        with os.scandir(data_dir) as entries:
+            sizes = [(entry.name, entry.stat().st_size)
+                     for entry in entries if entry.is_file(follow_symlinks=False)]
+
+        total_bytes = sum(size for _, size in sizes)
+        data_info["file_count"] = len(sizes)
+        data_info["total_size_mb"] = round(total_bytes / 1048576, 2)
+
+        # 仅在需要逐文件明细的调试级别才构造字典列表
+        if logger.isEnabledFor(logging.DEBUG):
+            data_info["files"] = [
+                {"name": name, "size_mb": round(size / 1048576, 2)}
+                for name, size in sizes
+            ]
             for file_info in data_info["files"]:
                 logger.debug(f"文件: {file_info['name']}, 大小: {file_info['size_mb']} MB")
+
+        if data_info["file_count"]:
+            logger.info(f"数据目录中有 {data_info['file_count']} 个文件，总大小: {data_info['total_size_mb']} MB")
         else:
             logger.warning("数据目录为空")
     else:
         logger.warning(f"数据目录不存在: {data_dir}")
-    
-    return data_info["exists"] and len(data_info["files"]) > 0, data_info
+
+    return data_info["exists"] and data_info["file_count"] > 0, data_info
 
 def generate_report(results, output_dir=None):
     """生成环境检查报告"""
@@ -336,32 +370,28 @@ def generate_report(results, output_dir=None):
     
     print(f"\n总体结果: {report['overall']}")
     
-    # 如果指定了输出目录，保存报告
+    # 如果指定了输出目录，保存报告；紧凑序列化后交给后台线程落盘，主流程无需等待磁盘。
+    # 线程必须是非daemon的：解释器退出前会等它写完，daemon线程会被直接杀掉导致报告丢失
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
         report_file = os.path.join(output_dir, f"env_check_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-        
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
-        
-        logger.info(f"环境检查报告已保存到: {report_file}")
-    
+
+        if orjson is not None:
+            payload = orjson.dumps(report)
+        else:
+            payload = json.dumps(report, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        def _write_report():
+            with open(report_file, 'wb') as f:
+                f.write(payload)
+            logger.info(f"环境检查报告已保存到: {report_file}")
+
+        threading.Thread(target=_write_report).start()
+
     return report
 
-def main():
-    """主函数"""
-    parser = argparse.ArgumentParser(description="检查Milvus基准测试环境")
-    parser.add_argument('--output-dir', type=str, default=None,
-                        help='输出目录路径 (用于保存环境检查报告)')
-    parser.add_argument('--verbose', action='store_true',
-                        help='显示详细日志')
-    parser.add_argument('--milvus-host', type=str, default='localhost',
-                        help='Milvus服务器主机名')
-    parser.add_argument('--milvus-port', type=str, default='19530',
-                        help='Milvus服务器端口')
-    
-    args = parser.parse_args()
-    
+def run(args):
+    """执行环境检查，args为已解析的参数命名空间"""
     # 设置日志级别
     if args.verbose:
         logger.setLevel(logging.DEBUG)
@@ -383,27 +413,26 @@ def main():
         "milvus": {},
         "data": {}
     }
-    
-    # 检查Python版本
-    results["python"]["success"], results["python"]["version"] = check_python_version()
-    
-    # 检查依赖项
-    results["dependencies"]["success"], results["dependencies"]["details"] = check_dependencies()
-    
-    # 检查Docker
-    results["docker"]["success"], results["docker"]["details"] = check_docker()
-    
-    # 检查系统资源
-    results["resources"]["success"], results["resources"]["details"] = check_system_resources()
-    
-    # 检查Milvus连接
-    results["milvus"]["success"], results["milvus"]["details"] = check_milvus_connection(
-        host=args.milvus_host, 
-        port=args.milvus_port
-    )
-    
-    # 检查数据目录
-    results["data"]["success"], results["data"]["details"] = check_data_directory()
+
+    # 各项检查相互独立且以阻塞I/O为主，并发执行使总耗时取决于最慢的一项
+    checks = [
+        ("python", check_python_version),
+        ("dependencies", check_dependencies),
+        ("docker", check_docker),
+        ("resources", check_system_resources),
+        ("milvus", lambda: check_milvus_connection(host=args.milvus_host, port=args.milvus_port)),
+        ("data", check_data_directory)
+    ]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = {name: executor.submit(fn) for name, fn in checks}
+
+        results["python"]["success"], results["python"]["version"] = futures["python"].result()
+        results["dependencies"]["success"], results["dependencies"]["details"] = futures["dependencies"].result()
+        results["docker"]["success"], results["docker"]["details"] = futures["docker"].result()
+        results["resources"]["success"], results["resources"]["details"] = futures["resources"].result()
+        results["milvus"]["success"], results["milvus"]["details"] = futures["milvus"].result()
+        results["data"]["success"], results["data"]["details"] = futures["data"].result()
     
     # 生成报告
     report = generate_report(results, output_dir)
@@ -411,6 +440,22 @@ def main():
     # 返回状态码
     return 0 if report["overall"] == "通过" else 1
 
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="检查Milvus基准测试环境")
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='输出目录路径 (用于保存环境检查报告)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='显示详细日志')
+    parser.add_argument('--milvus-host', type=str,
+                        default=os.environ.get('MILVUS_HOST', 'localhost'),
+                        help='Milvus服务器主机名 (默认读取MILVUS_HOST环境变量)')
+    parser.add_argument('--milvus-port', type=str,
+                        default=os.environ.get('MILVUS_PORT', '19530'),
+                        help='Milvus服务器端口 (默认读取MILVUS_PORT环境变量)')
+
+    args = parser.parse_args()
+    return run(args)
+
 if __name__ == "__main__":
-    import argparse
     sys.exit(main()) 
\ No newline at end of file
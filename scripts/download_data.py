@@ -2,14 +2,24 @@
 # -*- coding: utf-8 -*-
 
 import os
+import io
+import json
 import requests
 import numpy as np
 from tqdm import tqdm
 import gzip
 import shutil
+import struct
+
+# isal的igzip用ISA-L的SIMD指令做inflate，比zlib快2-3倍，可用时优先使用
+try:
+    from isal import igzip as _igzip
+except ImportError:
+    _igzip = gzip
 import time
 import sys
 import random
+import concurrent.futures
 from urllib.parse import urlparse
 
 # 创建数据目录
@@ -19,26 +29,98 @@ os.makedirs(DATA_DIR, exist_ok=True)
 # 最大重试次数
 MAX_RETRIES = 3
 
-def download_file(url, filename, retries=0):
-    """下载文件并显示进度条"""
+# 解压读取缓冲区大小，128KiB可显著摊薄Python层循环和分配开销
+READ_BUFFER_SIZE = 128 * 1024
+
+# 进度条批量刷新阈值，避免大文件下载时每个数据块都进入tqdm的限速逻辑
+PROGRESS_UPDATE_BYTES = 32 * 1024 * 1024
+
+# 下载请求头
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 复用连接池的会话，重试和同主机多文件下载可跳过DNS解析与TLS握手
+SESSION = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+def _head_info(url):
+    """HEAD探测远端文件的大小和ETag，失败时返回None"""
+    try:
+        response = SESSION.head(url, headers=HEADERS, timeout=10, allow_redirects=True)
+        if response.status_code == 200:
+            return {
+                "content_length": int(response.headers.get('Content-Length', 0) or 0),
+                "etag": response.headers.get('ETag')
+            }
+    except Exception:
+        pass
+    return None
+
+def _meta_matches(meta_path, head):
+    """检查本地缓存的下载元数据是否与服务器当前状态一致"""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (head.get("etag") is not None
+            and meta.get("etag") == head["etag"]
+            and meta.get("content_length") == head["content_length"])
+
+def _write_meta(meta_path, head):
+    """下载成功后记录来源元数据，供下次跳过重复下载"""
+    try:
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(head, f)
+    except OSError:
+        pass
+
+def download_file(url, filename, retries=0, position=None):
+    """下载文件并显示进度条，已完整下载的文件直接复用，部分下载尝试断点续传"""
+    file_path = os.path.join(DATA_DIR, filename)
+    meta_path = file_path + '.meta.json'
+
     try:
+        head = _head_info(url)
+
+        # 本地文件完整且与服务器的ETag/大小一致时跳过下载
+        if (head and os.path.exists(file_path) and _meta_matches(meta_path, head)
+                and head["content_length"] > 0
+                and os.path.getsize(file_path) == head["content_length"]):
+            print(f"{filename} 已存在且与服务器一致，跳过下载")
+            return file_path
+
+        # 检测到不完整的本地文件时用Range请求续传
+        resume_from = 0
+        request_headers = dict(HEADERS)
+        if head and head["content_length"] > 0 and os.path.exists(file_path):
+            local_size = os.path.getsize(file_path)
+            if 0 < local_size < head["content_length"]:
+                request_headers['Range'] = f'bytes={local_size}-'
+                resume_from = local_size
+
         print(f"正在从 {url} 下载文件...")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, stream=True, headers=headers, timeout=30)
+        response = SESSION.get(url, stream=True, headers=request_headers, timeout=30)
+
+        # 服务器不支持断点续传（未回复206）时退回整文件下载
+        if resume_from and response.status_code != 206:
+            resume_from = 0
+            response = SESSION.get(url, stream=True, headers=HEADERS, timeout=30)
         
         # 检查响应状态
-        if response.status_code != 200:
+        if response.status_code not in (200, 206):
             print(f"下载失败，状态码: {response.status_code}")
             if retries < MAX_RETRIES:
                 print(f"尝试重新下载 (尝试 {retries+1}/{MAX_RETRIES})...")
                 time.sleep(2)  # 等待2秒后重试
-                return download_file(url, filename, retries+1)
+                return download_file(url, filename, retries+1, position=position)
             else:
                 print("达到最大重试次数，下载失败")
                 return None
-        
+
         # 检查内容类型，如果是HTML可能是错误页面
         content_type = response.headers.get('Content-Type', '')
         if 'text/html' in content_type or 'text/plain' in content_type:
@@ -49,52 +131,136 @@ def download_file(url, filename, retries=0):
                 if retries < MAX_RETRIES:
                     print(f"尝试重新下载 (尝试 {retries+1}/{MAX_RETRIES})...")
                     time.sleep(2)  # 等待2秒后重试
-                    return download_file(url, filename, retries+1)
+                    return download_file(url, filename, retries+1, position=position)
                 else:
                     print("达到最大重试次数，下载失败")
                     return None
         
-        total_size = int(response.headers.get('content-length', 0))
-        block_size = 1024  # 1 Kibibyte
+        total_size = resume_from + int(response.headers.get('content-length', 0))
+        block_size = 1024 * 1024  # 1 MiB，大块读取减少每块的Python开销
         progress_bar = tqdm(
             total=total_size,
+            initial=resume_from,
             unit='iB',
             unit_scale=True,
-            desc=f"下载 {filename}"
+            desc=f"下载 {filename}",
+            position=position,
+            leave=True,
+            mininterval=0.5
         )
-        
-        file_path = os.path.join(DATA_DIR, filename)
-        with open(file_path, 'wb') as f:
+
+        # 进度累积到阈值才上报，下载循环里只剩write和计数
+        pending = 0
+        with open(file_path, 'ab' if resume_from else 'wb') as f:
             for data in response.iter_content(block_size):
-                progress_bar.update(len(data))
                 f.write(data)
+                pending += len(data)
+                if pending >= PROGRESS_UPDATE_BYTES:
+                    progress_bar.update(pending)
+                    pending = 0
+        if pending:
+            progress_bar.update(pending)
         progress_bar.close()
-        
+
         if total_size != 0 and progress_bar.n != total_size:
             print("下载可能不完整")
             if retries < MAX_RETRIES:
                 print(f"尝试重新下载 (尝试 {retries+1}/{MAX_RETRIES})...")
                 time.sleep(2)  # 等待2秒后重试
-                return download_file(url, filename, retries+1)
-        
+                return download_file(url, filename, retries+1, position=position)
+
+        if head:
+            _write_meta(meta_path, head)
         return file_path
     except Exception as e:
         print(f"下载过程中出现错误: {e}")
         if retries < MAX_RETRIES:
             print(f"尝试重新下载 (尝试 {retries+1}/{MAX_RETRIES})...")
             time.sleep(2)  # 等待2秒后重试
-            return download_file(url, filename, retries+1)
+            return download_file(url, filename, retries+1, position=position)
         else:
             print("达到最大重试次数，下载失败")
             return None
 
+def download_and_extract(url, dest_path, retries=0, position=None):
+    """流式下载.gz文件并边下边解压到dest_path，省去压缩包落盘再读回的一轮磁盘I/O；
+    来源未变更且本地已有解压结果时直接复用"""
+    meta_path = dest_path + '.meta.json'
+
+    try:
+        head = _head_info(url)
+        if head and os.path.exists(dest_path) and _meta_matches(meta_path, head):
+            print(f"{os.path.basename(dest_path)} 已存在且来源未变更，跳过下载")
+            return True
+
+        print(f"正在从 {url} 流式下载并解压...")
+        response = SESSION.get(url, stream=True, headers=HEADERS, timeout=30)
+
+        # 检查响应状态
+        if response.status_code != 200:
+            print(f"下载失败，状态码: {response.status_code}")
+            if retries < MAX_RETRIES:
+                print(f"尝试重新下载 (尝试 {retries+1}/{MAX_RETRIES})...")
+                time.sleep(2)  # 等待2秒后重试
+                return download_and_extract(url, dest_path, retries+1, position=position)
+            else:
+                print("达到最大重试次数，下载失败")
+                return False
+
+        total_size = int(response.headers.get('content-length', 0))
+        progress_bar = tqdm(
+            total=total_size,
+            unit='iB',
+            unit_scale=True,
+            desc=f"下载 {os.path.basename(url)}",
+            position=position,
+            leave=True,
+            mininterval=0.5
+        )
+
+        # gzip是流式格式，直接包裹HTTP原始流解压，按压缩字节数推进进度条
+        raw = response.raw
+        # 可用时用isal的SIMD加速inflate，与extract_gzip同一后备逻辑
+        with _igzip.GzipFile(fileobj=raw) as gz:
+            with open(dest_path, 'wb') as f_out:
+                while True:
+                    buf = gz.read(READ_BUFFER_SIZE)
+                    if not buf:
+                        break
+                    f_out.write(buf)
+                    progress_bar.update(raw.tell() - progress_bar.n)
+        progress_bar.close()
+
+        if head:
+            _write_meta(meta_path, head)
+        return True
+    except Exception as e:
+        print(f"下载过程中出现错误: {e}")
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        if retries < MAX_RETRIES:
+            print(f"尝试重新下载 (尝试 {retries+1}/{MAX_RETRIES})...")
+            time.sleep(2)  # 等待2秒后重试
+            return download_and_extract(url, dest_path, retries+1, position=position)
+        else:
+            print("达到最大重试次数，下载失败")
+            return False
+
 def extract_gzip(gzip_path, extract_path):
     """解压gzip文件"""
     try:
         print(f"正在解压 {gzip_path}...")
-        with gzip.open(gzip_path, 'rb') as f_in:
-            with open(extract_path, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+        # 用128KiB缓冲分块读取，替代copyfileobj默认的16KiB小块；
+        # 大块读取同时避开CPython 3.12前gzip模块小块读取时
+        # _PaddedFile反复回卷重复拷贝压缩数据的问题
+        with _igzip.open(gzip_path, 'rb') as gz:
+            with io.BufferedReader(gz, buffer_size=READ_BUFFER_SIZE) as f_in:
+                with open(extract_path, 'wb') as f_out:
+                    while True:
+                        buf = f_in.read(READ_BUFFER_SIZE)
+                        if not buf:
+                            break
+                        f_out.write(buf)
         print(f"已解压: {extract_path}")
         return True
     except gzip.BadGzipFile:
@@ -104,6 +270,24 @@ def extract_gzip(gzip_path, extract_path):
         print(f"解压过程中出现错误: {e}")
         return False
 
+def _fetch_and_extract(base_url, filename, desc, position=None):
+    """下载单个文件并在需要时解压，返回(是否成功, 产生的文件路径列表)"""
+    print(f"开始下载{desc}...")
+    file_url = f"{base_url}/{filename}"
+
+    # .gz文件边下边解压，不在磁盘上保留压缩包
+    if filename.endswith('.gz'):
+        extract_path = os.path.join(DATA_DIR, filename[:-3])  # 去掉.gz后缀
+        if not download_and_extract(file_url, extract_path, position=position):
+            return False, [extract_path] if os.path.exists(extract_path) else []
+        return True, [extract_path]
+
+    # 其他格式（如HDF5）直接下载
+    file_path = download_file(file_url, filename, position=position)
+    if not file_path:
+        return False, []
+    return True, [file_path]
+
 def download_sift():
     """下载并处理SIFT数据集"""
     # 尝试多个数据源
@@ -134,31 +318,19 @@ def download_sift():
         hostname = urlparse(base_url).netloc
         
         print(f"\n尝试从 {hostname} 下载数据集...")
-        download_success = True
-        downloaded_files = []
-        
-        for filename, desc in files.items():
-            print(f"开始下载{desc}...")
-            file_url = f"{base_url}/{filename}"
-            
-            # 下载压缩文件
-            gz_path = download_file(file_url, filename)
-            if not gz_path:
-                download_success = False
-                break
-            
-            downloaded_files.append(gz_path)
-            
-            # 如果是.gz文件，尝试解压
-            if filename.endswith('.gz'):
-                extract_path = os.path.join(DATA_DIR, filename[:-3])  # 去掉.gz后缀
-                if not extract_gzip(gz_path, extract_path):
-                    download_success = False
-                    break
-                
-                # 删除压缩文件
-                os.remove(gz_path)
-            
+
+        # 同一数据源的多个文件相互独立且受限于网络延迟，并发下载可叠加带宽；
+        # tqdm的position参数让各文件的进度条各占一行互不干扰
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(3, len(files))) as executor:
+            futures = [
+                executor.submit(_fetch_and_extract, base_url, filename, desc, position)
+                for position, (filename, desc) in enumerate(files.items())
+            ]
+            outcomes = [future.result() for future in futures]
+
+        download_success = all(ok for ok, _ in outcomes)
+        downloaded_files = [path for _, paths in outcomes for path in paths]
+
         if download_success:
             print(f"从 {hostname} 下载数据集成功")
             # 如果下载了HDF5格式，需要转换
@@ -176,51 +348,54 @@ def download_sift():
     print("所有下载源均失败")
     return False
 
+def _copy_h5_dataset(dset, out_path, chunk_rows=65536):
+    """把HDF5数据集按行块直拷到.npy文件，read_direct免去中间缓冲，
+    峰值内存只有一个行块而不是整个数据集"""
+    arr = np.lib.format.open_memmap(out_path, mode='w+', dtype=dset.dtype, shape=dset.shape)
+    for start in range(0, dset.shape[0], chunk_rows):
+        end = min(start + chunk_rows, dset.shape[0])
+        sel = np.s_[start:end]
+        dset.read_direct(arr, source_sel=sel, dest_sel=sel)
+    arr.flush()
+    return arr
+
 def convert_hdf5_to_numpy():
     """将HDF5格式的数据集转换为numpy格式"""
     try:
         import h5py
         hdf5_path = os.path.join(DATA_DIR, "sift-128-euclidean.hdf5")
-        
+
         if not os.path.exists(hdf5_path):
             print(f"错误: HDF5文件 {hdf5_path} 不存在")
             return False
-        
+
         print("正在读取HDF5文件...")
         with h5py.File(hdf5_path, 'r') as f:
             # 读取训练和测试数据
             print("数据集包含以下键:")
             for key in f.keys():
                 print(f"  - {key}")
-            
-            # 读取向量数据
+
+            # 流式转存向量数据
             print("处理基础向量集...")
-            base_vectors = f['train'][:]
+            base_vectors = _copy_h5_dataset(f['train'], os.path.join(DATA_DIR, "sift_base.npy"))
             print(f"基础向量集维度: {base_vectors.shape}")
-            
+
             print("处理查询向量集...")
-            query_vectors = f['test'][:]
+            query_vectors = _copy_h5_dataset(f['test'], os.path.join(DATA_DIR, "sift_query.npy"))
             print(f"查询向量集维度: {query_vectors.shape}")
-            
+
             # 读取距离信息作为真实结果
             print("处理真实结果集...")
-            if 'distances' in f:
-                distances = f['distances'][:]
-                neighbors = f['neighbors'][:]
+            if 'neighbors' in f:
+                neighbors = _copy_h5_dataset(f['neighbors'], os.path.join(DATA_DIR, "sift_groundtruth.npy"))
                 print(f"真实结果维度: {neighbors.shape}")
             else:
                 # 如果没有提供真实结果，计算欧几里得距离
                 print("数据集中没有真实结果，使用暴力计算（取前100个结果）...")
-                from sklearn.neighbors import NearestNeighbors
-                nbrs = NearestNeighbors(n_neighbors=100, algorithm='brute', metric='euclidean').fit(base_vectors)
-                distances, neighbors = nbrs.kneighbors(query_vectors)
-        
-        # 保存为numpy格式
-        print("保存为numpy格式...")
-        np.save(os.path.join(DATA_DIR, "sift_base.npy"), base_vectors)
-        np.save(os.path.join(DATA_DIR, "sift_query.npy"), query_vectors)
-        np.save(os.path.join(DATA_DIR, "sift_groundtruth.npy"), neighbors)
-        
+                neighbors = brute_force_knn(base_vectors, query_vectors, k=100)
+                np.save(os.path.join(DATA_DIR, "sift_groundtruth.npy"), neighbors)
+
         print("HDF5转换完成")
         return True
     except ImportError:
@@ -230,38 +405,107 @@ def convert_hdf5_to_numpy():
         print(f"转换过程中发生错误: {e}")
         return False
 
+def _peek_vecs_dim(filename):
+    """只读文件前4个字节校验维度并推算行数，坏文件在建立映射前就能报错"""
+    with open(filename, 'rb') as f:
+        dim_bytes = f.read(4)
+    if len(dim_bytes) < 4:
+        raise ValueError(f"文件 {filename} 是空的")
+
+    dim = struct.unpack('<i', dim_bytes)[0]
+    if dim <= 0 or dim > 10000:  # 检查维度是否合理
+        raise ValueError(f"读取到不合理的维度值: {dim}")
+
+    total_bytes = os.path.getsize(filename)
+    row_bytes = (dim + 1) * 4
+    if total_bytes % row_bytes != 0:
+        raise ValueError(f"文件 {filename} 大小({total_bytes})不是行宽({row_bytes})的整数倍")
+    return dim, total_bytes // row_bytes
+
 def load_fvecs(filename):
-    """加载fvecs格式文件"""
+    """加载fvecs格式文件，返回内存映射视图，避免整文件读入内存再复制"""
     try:
-        fv = np.fromfile(filename, dtype=np.float32)
-        if fv.size == 0:
-            raise ValueError(f"文件 {filename} 是空的")
-            
-        dim = fv.view(np.int32)[0]
-        if dim <= 0 or dim > 10000:  # 检查维度是否合理
-            raise ValueError(f"读取到不合理的维度值: {dim}")
-            
-        return fv.reshape(-1, dim + 1)[:, 1:].copy()
+        dim, n = _peek_vecs_dim(filename)
+        # 去掉每行前置的维度字段，返回零拷贝视图，由操作系统按需分页读入
+        return np.memmap(filename, dtype=np.float32, mode='r', shape=(n, dim + 1))[:, 1:]
     except Exception as e:
         print(f"加载fvecs文件时出错: {e}")
         return None
 
 def load_ivecs(filename):
-    """加载ivecs格式文件"""
+    """加载ivecs格式文件，返回内存映射视图，避免整文件读入内存再复制"""
     try:
-        iv = np.fromfile(filename, dtype=np.int32)
-        if iv.size == 0:
-            raise ValueError(f"文件 {filename} 是空的")
-            
-        dim = iv[0]
-        if dim <= 0 or dim > 10000:  # 检查维度是否合理
-            raise ValueError(f"读取到不合理的维度值: {dim}")
-            
-        return iv.reshape(-1, dim + 1)[:, 1:].copy()
+        dim, n = _peek_vecs_dim(filename)
+        return np.memmap(filename, dtype=np.int32, mode='r', shape=(n, dim + 1))[:, 1:]
     except Exception as e:
         print(f"加载ivecs文件时出错: {e}")
         return None
 
+def brute_force_knn(base_vectors, query_vectors, k=100):
+    """暴力计算query在base中的前k个欧氏近邻。
+    用一次GEMM展开平方距离(‖y‖²+‖x‖²−2y·xᵀ)交给多线程BLAS，
+    再用O(n)的argpartition选出前k个，远快于逐查询的Python实现"""
+    # 全程保持float32：BLAS分派sgemm而非dgemm，SIMD通道数翻倍且内存带宽减半
+    base = np.ascontiguousarray(base_vectors, dtype=np.float32)
+    query = np.ascontiguousarray(query_vectors, dtype=np.float32)
+
+    xx = (base * base).sum(axis=1)
+    yy = (query * query).sum(axis=1)
+    distances = yy[:, None] + xx[None, :] - 2.0 * (query @ base.T)
+
+    # argpartition不保证前k个内部有序，按距离再排一次
+    part = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(distances, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+def save_npy_blockwise(path, src, block_bytes=16 * 1024 * 1024):
+    """把数组视图按16MiB行块写入.npy文件，磁盘写与内存读流水线进行，
+    不在内存中物化完整副本"""
+    dest = np.lib.format.open_memmap(path, mode='w+', dtype=src.dtype, shape=src.shape)
+    rows_per_block = max(1, block_bytes // max(1, src.shape[1] * src.itemsize))
+    for start in range(0, src.shape[0], rows_per_block):
+        end = min(start + rows_per_block, src.shape[0])
+        np.copyto(dest[start:end], src[start:end], casting='no')
+    dest.flush()
+
+def vecs_to_npy_sendfile(src_path, out_path, dtype):
+    """在Linux上用sendfile把fvecs/ivecs的数据区逐行拷入.npy文件，
+    跳过每行4字节的维度前缀，数据不经过用户态缓冲；
+    平台不支持或拷贝失败时返回False，由调用方改走分块拷贝路径"""
+    if not hasattr(os, 'sendfile'):
+        return False
+
+    header = np.memmap(src_path, dtype=np.int32, mode='r')
+    dim = int(header[0])
+    n = header.size // (dim + 1)
+    row_bytes = dim * 4
+    stride = (dim + 1) * 4
+    del header
+
+    try:
+        with open(src_path, 'rb') as f_in:
+            with open(out_path, 'wb') as f_out:
+                np.lib.format.write_array_header_2_0(f_out, {
+                    'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                    'fortran_order': False,
+                    'shape': (n, dim)
+                })
+                f_out.flush()
+
+                in_fd = f_in.fileno()
+                out_fd = f_out.fileno()
+                offset = 4  # 跳过首行的维度前缀
+                for _ in range(n):
+                    sent = 0
+                    while sent < row_bytes:
+                        sent += os.sendfile(out_fd, in_fd, offset + sent, row_bytes - sent)
+                    offset += stride
+        return True
+    except OSError:
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        return False
+
 def process_data():
     """处理下载的数据集为numpy格式"""
     # 检查是否已经存在处理好的numpy文件
@@ -302,12 +546,25 @@ def process_data():
     if groundtruth is None:
         return False
     print(f"真实结果集维度: {groundtruth.shape}")
-    
-    # 保存为numpy格式
-    np.save(os.path.join(DATA_DIR, "sift_base.npy"), base_vectors)
-    np.save(os.path.join(DATA_DIR, "sift_query.npy"), query_vectors)
-    np.save(os.path.join(DATA_DIR, "sift_groundtruth.npy"), groundtruth)
-    
+
+    # 保存为numpy格式，Linux上优先用sendfile在内核内完成拷贝，
+    # 其他平台退回到分块mmap拷贝
+    conversions = [
+        (base_file, "sift_base.npy", base_vectors),
+        (query_file, "sift_query.npy", query_vectors),
+        (groundtruth_file, "sift_groundtruth.npy", groundtruth)
+    ]
+    for src_path, npy_name, view in conversions:
+        out_path = os.path.join(DATA_DIR, npy_name)
+        if not vecs_to_npy_sendfile(src_path, out_path, view.dtype):
+            save_npy_blockwise(out_path, view)
+
+    # 真实数据就位后清掉之前可能生成的随机示例归档，避免残留误用
+    sample_npz = os.path.join(DATA_DIR, "sift.npz")
+    if os.path.exists(sample_npz):
+        os.remove(sample_npz)
+        print("已删除过期的示例数据集 sift.npz")
+
     print("数据已处理并保存为numpy格式")
     return True
 
@@ -328,22 +585,20 @@ def download_sample_dataset():
     
     # 计算近邻作为真实结果
     print("计算真实结果集...")
-    from sklearn.neighbors import NearestNeighbors
-    nbrs = NearestNeighbors(n_neighbors=100, algorithm='brute', metric='euclidean').fit(base_vectors)
-    distances, neighbors = nbrs.kneighbors(query_vectors)
+    neighbors = brute_force_knn(base_vectors, query_vectors, k=100)
     
-    # 保存为numpy格式
+    # 保存为numpy格式，三个数组合并进一个npz归档，只经历一次打开/关闭
     print("保存为numpy格式...")
-    np.save(os.path.join(DATA_DIR, "sift_base.npy"), base_vectors)
-    np.save(os.path.join(DATA_DIR, "sift_query.npy"), query_vectors)
-    np.save(os.path.join(DATA_DIR, "sift_groundtruth.npy"), neighbors)
+    np.savez(os.path.join(DATA_DIR, "sift.npz"),
+             base=base_vectors, query=query_vectors, groundtruth=neighbors)
     
     print("示例数据集已生成")
     return True
 
-if __name__ == "__main__":
+def run(args=None):
+    """下载并准备SIFT数据集，args为已解析的参数命名空间（当前无可用选项）"""
     print("开始下载SIFT数据集...")
-    
+
     if download_sift():
         print("下载成功")
         print("开始处理数据...")
@@ -353,13 +608,18 @@ if __name__ == "__main__":
                 print("已生成示例数据集")
             else:
                 print("无法生成示例数据集")
-                sys.exit(1)
+                return False
     else:
         print("下载数据集失败，尝试生成示例数据集...")
         if download_sample_dataset():
             print("已生成示例数据集")
         else:
             print("无法生成示例数据集")
-            sys.exit(1)
-    
-    print("数据集准备完成！") 
\ No newline at end of file
+            return False
+
+    print("数据集准备完成！")
+    return True
+
+if __name__ == "__main__":
+    if not run():
+        sys.exit(1) 
\ No newline at end of file
@@ -1,241 +1,328 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-
-import os
-import json
-import pandas as pd
-import argparse
-import matplotlib.pyplot as plt
-import seaborn as sns
-from tabulate import tabulate
-import sys
-import numpy as np
-import logging
-
-# 添加项目根目录到路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from scripts.logger import setup_logger
-
-# 设置日志
-logger = setup_logger('results_explainer')
-
-def load_results(results_dir):
-    """加载结果文件"""
-    results = []
-    logger.info(f"从目录加载结果: {results_dir}")
-    
-    if not os.path.exists(results_dir):
-        logger.error(f"结果目录不存在: {results_dir}")
-        return results
-        
-    for filename in os.listdir(results_dir):
-        if filename.endswith('.json'):
-            file_path = os.path.join(results_dir, filename)
-            logger.debug(f"处理文件: {file_path}")
-            
-            with open(file_path, 'r') as f:
-                try:
-                    data = json.load(f)
-                    results.append(data)
-                    logger.debug(f"成功加载文件: {filename}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"无法解析文件 {filename}: {e}")
-    
-    logger.info(f"共加载了 {len(results)} 个结果文件")
-    return results
-
-def explain_results(results, output_dir=None):
-    """解释结果"""
-    if not results:
-        logger.warning("没有结果可供分析")
-        return
-        
-    # 提取关键指标
-    metrics = []
-    for result in results:
-        for index_name, data in result.items():
-            if isinstance(data, dict) and 'metrics' in data:
-                metrics.append({
-                    'index_type': index_name,
-                    'build_time': data.get('build_time', 0),
-                    'avg_latency': data['metrics'].get('avg_latency', 0),
-                    'avg_recall': data['metrics'].get('avg_recall', 0),
-                    'qps': data['metrics'].get('qps', 0),
-                    'index_size': data.get('index_size', 0)
-                })
-    
-    if not metrics:
-        logger.warning("没有找到有效的指标数据")
-        return
-        
-    # 转换为DataFrame
-    df = pd.DataFrame(metrics)
-    logger.info(f"分析了 {len(df)} 种索引类型的性能")
-    
-    # 排序
-    df_latency = df.sort_values('avg_latency')
-    df_recall = df.sort_values('avg_recall', ascending=False)
-    df_qps = df.sort_values('qps', ascending=False)
-    
-    # 打印结果
-    print("\n=== Milvus索引性能分析报告 ===\n")
-    
-    print("\n最佳延迟性能 (毫秒):")
-    print(tabulate(df_latency[['index_type', 'avg_latency']].head(3), headers=['索引类型', '平均延迟(ms)'], tablefmt='pretty'))
-    
-    print("\n最佳召回率:")
-    print(tabulate(df_recall[['index_type', 'avg_recall']].head(3), headers=['索引类型', '平均召回率'], tablefmt='pretty'))
-    
-    print("\n最佳吞吐量 (QPS):")
-    print(tabulate(df_qps[['index_type', 'qps']].head(3), headers=['索引类型', '每秒查询数'], tablefmt='pretty'))
-    
-    print("\n索引构建时间 (秒):")
-    df_build = df.sort_values('build_time')
-    print(tabulate(df_build[['index_type', 'build_time']].head(3), headers=['索引类型', '构建时间(s)'], tablefmt='pretty'))
-    
-    # 计算综合评分
-    # 对每个指标进行归一化处理
-    df['norm_recall'] = df['avg_recall'] / df['avg_recall'].max() if df['avg_recall'].max() > 0 else 0
-    df['norm_latency'] = 1 - (df['avg_latency'] / df['avg_latency'].max() if df['avg_latency'].max() > 0 else 0)
-    df['norm_qps'] = df['qps'] / df['qps'].max() if df['qps'].max() > 0 else 0
-    df['norm_build'] = 1 - (df['build_time'] / df['build_time'].max() if df['build_time'].max() > 0 else 0)
-    
-    # 综合评分 (可根据需求调整权重)
-    df['score'] = (
-        df['norm_recall'] * 0.4 +  # 召回率权重40%
-        df['norm_latency'] * 0.3 +  # 延迟权重30%
-        df['norm_qps'] * 0.2 +      # 吞吐量权重20%
-        df['norm_build'] * 0.1      # 构建时间权重10%
-    )
-    
-    df_score = df.sort_values('score', ascending=False)
-    
-    print("\n综合评分 (综合考虑召回率、延迟、吞吐量和构建时间):")
-    print(tabulate(df_score[['index_type', 'score']].head(3), headers=['索引类型', '综合评分'], tablefmt='pretty'))
-    
-    # 提供建议
-    print("\n=== 索引选择建议 ===")
-    print(f"1. 对于追求准确性的场景，推荐使用: {df_recall.iloc[0]['index_type']}")
-    print(f"2. 对于追求低延迟的场景，推荐使用: {df_latency.iloc[0]['index_type']}")
-    print(f"3. 对于高吞吐量场景，推荐使用: {df_qps.iloc[0]['index_type']}")
-    print(f"4. 对于快速构建索引场景，推荐使用: {df_build.iloc[0]['index_type']}")
-    print(f"5. 综合性能最佳的索引: {df_score.iloc[0]['index_type']}")
-    
-    # 生成可视化图表
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # 设置绘图风格
-        sns.set(style="whitegrid")
-        
-        # 1. 延迟对比图
-        plt.figure(figsize=(10, 6))
-        chart = sns.barplot(x='index_type', y='avg_latency', data=df.sort_values('avg_latency'))
-        chart.set_title('不同索引类型的查询延迟对比')
-        chart.set_xlabel('索引类型')
-        chart.set_ylabel('平均延迟 (毫秒)')
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'latency_comparison.png'))
-        logger.info(f"已保存延迟对比图到 {output_dir}")
-        
-        # 2. 召回率对比图
-        plt.figure(figsize=(10, 6))
-        chart = sns.barplot(x='index_type', y='avg_recall', data=df.sort_values('avg_recall', ascending=False))
-        chart.set_title('不同索引类型的召回率对比')
-        chart.set_xlabel('索引类型')
-        chart.set_ylabel('平均召回率')
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'recall_comparison.png'))
-        logger.info(f"已保存召回率对比图到 {output_dir}")
-        
-        # 3. 综合评分图
-        plt.figure(figsize=(10, 6))
-        chart = sns.barplot(x='index_type', y='score', data=df.sort_values('score', ascending=False))
-        chart.set_title('不同索引类型的综合评分对比')
-        chart.set_xlabel('索引类型')
-        chart.set_ylabel('综合评分')
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'score_comparison.png'))
-        logger.info(f"已保存综合评分对比图到 {output_dir}")
-        
-        # 4. 雷达图 (综合性能)
-        categories = ['召回率', '延迟性能', '吞吐量', '构建速度']
-        
-        # 选择前3个索引进行对比
-        top_indices = df_score.head(3)['index_type'].tolist()
-        
-        plt.figure(figsize=(8, 8))
-        ax = plt.subplot(111, polar=True)
-        
-        # 设置雷达图的角度
-        angles = np.linspace(0, 2*np.pi, len(categories), endpoint=False).tolist()
-        angles += angles[:1]  # 闭合图形
-        
-        ax.set_theta_offset(np.pi / 2)
-        ax.set_theta_direction(-1)
-        ax.set_thetagrids(np.degrees(angles[:-1]), categories)
-        
-        for idx, index_type in enumerate(top_indices):
-            row = df[df['index_type'] == index_type].iloc[0]
-            values = [
-                row['norm_recall'],
-                row['norm_latency'],
-                row['norm_qps'],
-                row['norm_build']
-            ]
-            values += values[:1]  # 闭合图形
-            
-            ax.plot(angles, values, linewidth=2, linestyle='solid', label=index_type)
-            ax.fill(angles, values, alpha=0.1)
-        
-        ax.set_title('索引性能雷达图')
-        ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'radar_comparison.png'))
-        logger.info(f"已保存性能雷达图到 {output_dir}")
-    
-    # 导出分析结果到CSV
-    if output_dir:
-        csv_file = os.path.join(output_dir, 'index_analysis.csv')
-        df.to_csv(csv_file, index=False)
-        logger.info(f"已导出分析结果到 {csv_file}")
-    
-    logger.info("结果解释完成")
-    return df
-
-def main():
-    parser = argparse.ArgumentParser(description="解释Milvus基准测试结果")
-    parser.add_argument('--results-dir', type=str, default='../results',
-                        help='结果目录路径')
-    parser.add_argument('--output-dir', type=str, default=None,
-                        help='输出目录路径 (用于保存图表和分析结果)')
-    parser.add_argument('--verbose', action='store_true',
-                        help='显示详细日志')
-    
-    args = parser.parse_args()
-    
-    # 设置日志级别
-    if args.verbose:
-        logger.setLevel(logging.DEBUG)
-    
-    # 解析结果目录路径
-    results_dir = args.results_dir
-    if not os.path.isabs(results_dir):
-        # 如果是相对路径，则相对于脚本目录解析
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        results_dir = os.path.abspath(os.path.join(script_dir, results_dir))
-    
-    # 解析输出目录路径
-    output_dir = args.output_dir
-    if output_dir and not os.path.isabs(output_dir):
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        output_dir = os.path.abspath(os.path.join(script_dir, output_dir))
-    
-    results = load_results(results_dir)
-    if results:
-        explain_results(results, output_dir)
-    else:
-        print("未找到结果文件或结果文件为空")
-
-if __name__ == "__main__":
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import csv
+import json
+import argparse
+import sys
+import concurrent.futures
+import logging
+
+# numpy只在explain_results实际分析指标时用到，推迟到首次使用时导入，
+# 让--help、结果目录为空等早退路径省掉约50ms的导入开销
+np = None
+
+def _get_numpy():
+    """延迟导入numpy并缓存模块引用"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+# orjson的C解析器比标准库快数倍，可用时优先使用
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.logger import setup_logger
+
+# 设置日志
+logger = setup_logger('results_explainer')
+
+def _load_result_file(file_path):
+    """读取并解析单个JSON结果文件，失败时返回None"""
+    logger.debug(f"处理文件: {file_path}")
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        logger.debug(f"成功加载文件: {os.path.basename(file_path)}")
+        return data
+    except (ValueError, OSError) as e:
+        logger.error(f"无法解析文件 {os.path.basename(file_path)}: {e}")
+        return None
+
+def load_results(results_dir):
+    """加载结果文件"""
+    results = []
+    logger.info(f"从目录加载结果: {results_dir}")
+
+    if not os.path.exists(results_dir):
+        logger.error(f"结果目录不存在: {results_dir}")
+        return results
+
+    # scandir避免逐文件stat；磁盘读取+JSON解析相互独立，线程池并行处理
+    with os.scandir(results_dir) as entries:
+        paths = sorted(entry.path for entry in entries
+                       if entry.is_file() and entry.name.endswith('.json'))
+
+    if paths:
+        max_workers = min(len(paths), os.cpu_count() or 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = [data for data in executor.map(_load_result_file, paths)
+                       if data is not None]
+
+    logger.info(f"共加载了 {len(results)} 个结果文件")
+    return results
+
+# 指标表的结构化数组dtype
+_METRICS_DTYPE = [
+    ('index_type', 'U32'),
+    ('build_time', 'f8'),
+    ('avg_latency', 'f8'),
+    ('avg_recall', 'f8'),
+    ('qps', 'f8'),
+    ('index_size', 'i8')
+]
+
+def _print_table(headers, rows):
+    """打印简易对齐表格；不超过几行的表格不值得引入tabulate"""
+    str_rows = [[str(cell) for cell in row] for row in rows]
+    widths = [max(len(header), *(len(row[i]) for row in str_rows))
+              for i, header in enumerate(headers)]
+    sep = '+-' + '-+-'.join('-' * w for w in widths) + '-+'
+    print(sep)
+    print('| ' + ' | '.join(h.ljust(w) for h, w in zip(headers, widths)) + ' |')
+    print(sep)
+    for row in str_rows:
+        print('| ' + ' | '.join(cell.ljust(w) for cell, w in zip(row, widths)) + ' |')
+    print(sep)
+
+def _render_plots(arr, by_latency, by_recall, score, score_order,
+                  norm_recall, norm_latency, norm_qps, norm_build, output_dir):
+    """生成可视化图表；matplotlib/seaborn只在需要出图时才导入"""
+    import matplotlib
+    matplotlib.use('Agg')  # 纯文件输出，跳过GUI后端探测
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # 设置绘图风格
+    sns.set(style="whitegrid")
+    
+    # 图表对象用完即关，循环调用（如面板定时刷新）时RSS不随调用次数增长
+    # 1. 延迟对比图
+    fig = plt.figure(figsize=(10, 6))
+    chart = sns.barplot(x=by_latency.index_type, y=by_latency.avg_latency)
+    chart.set_title('不同索引类型的查询延迟对比')
+    chart.set_xlabel('索引类型')
+    chart.set_ylabel('平均延迟 (毫秒)')
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'latency_comparison.png'))
+    plt.close(fig)
+    logger.info(f"已保存延迟对比图到 {output_dir}")
+
+    # 2. 召回率对比图
+    fig = plt.figure(figsize=(10, 6))
+    chart = sns.barplot(x=by_recall.index_type, y=by_recall.avg_recall)
+    chart.set_title('不同索引类型的召回率对比')
+    chart.set_xlabel('索引类型')
+    chart.set_ylabel('平均召回率')
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'recall_comparison.png'))
+    plt.close(fig)
+    logger.info(f"已保存召回率对比图到 {output_dir}")
+
+    # 3. 综合评分图
+    fig = plt.figure(figsize=(10, 6))
+    chart = sns.barplot(x=arr.index_type[score_order], y=score[score_order])
+    chart.set_title('不同索引类型的综合评分对比')
+    chart.set_xlabel('索引类型')
+    chart.set_ylabel('综合评分')
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'score_comparison.png'))
+    plt.close(fig)
+    logger.info(f"已保存综合评分对比图到 {output_dir}")
+
+    # 4. 雷达图 (综合性能)
+    categories = ['召回率', '延迟性能', '吞吐量', '构建速度']
+
+    # 选择前3个索引进行对比
+    top_indices = score_order[:3]
+
+    fig = plt.figure(figsize=(8, 8))
+    ax = fig.add_subplot(111, polar=True)
+
+    # 设置雷达图的角度
+    angles = np.linspace(0, 2*np.pi, len(categories), endpoint=False).tolist()
+    angles += angles[:1]  # 闭合图形
+    
+    ax.set_theta_offset(np.pi / 2)
+    ax.set_theta_direction(-1)
+    ax.set_thetagrids(np.degrees(angles[:-1]), categories)
+    
+    for i in top_indices:
+        values = [
+            norm_recall[i],
+            norm_latency[i],
+            norm_qps[i],
+            norm_build[i]
+        ]
+        values += values[:1]  # 闭合图形
+
+        ax.plot(angles, values, linewidth=2, linestyle='solid', label=arr.index_type[i])
+        ax.fill(angles, values, alpha=0.1)
+    
+    ax.set_title('索引性能雷达图')
+    ax.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'radar_comparison.png'))
+    plt.close(fig)
+    logger.info(f"已保存性能雷达图到 {output_dir}")
+
+def explain_results(results, output_dir=None):
+    """解释结果"""
+    if not results:
+        logger.warning("没有结果可供分析")
+        return
+        
+    # 提取关键指标
+    metrics = []
+    for result in results:
+        for index_name, data in result.items():
+            if isinstance(data, dict) and 'metrics' in data:
+                metrics.append({
+                    'index_type': index_name,
+                    'build_time': data.get('build_time', 0),
+                    'avg_latency': data['metrics'].get('avg_latency', 0),
+                    'avg_recall': data['metrics'].get('avg_recall', 0),
+                    'qps': data['metrics'].get('qps', 0),
+                    'index_size': data.get('index_size', 0)
+                })
+    
+    if not metrics:
+        logger.warning("没有找到有效的指标数据")
+        return
+
+    np = _get_numpy()
+
+    # 转换为结构化数组，n≤20行的表用不上DataFrame的开销
+    arr = np.rec.fromrecords(
+        [(m['index_type'], m['build_time'], m['avg_latency'],
+          m['avg_recall'], m['qps'], m['index_size']) for m in metrics],
+        dtype=_METRICS_DTYPE
+    )
+    logger.info(f"分析了 {len(arr)} 种索引类型的性能")
+
+    # 排序（argsort返回索引，切片不复制数据）
+    by_latency = arr[np.argsort(arr.avg_latency)]
+    by_recall = arr[np.argsort(arr.avg_recall)[::-1]]
+    by_qps = arr[np.argsort(arr.qps)[::-1]]
+    by_build = arr[np.argsort(arr.build_time)]
+
+    # 打印结果
+    print("\n=== Milvus索引性能分析报告 ===\n")
+
+    print("\n最佳延迟性能 (毫秒):")
+    _print_table(['索引类型', '平均延迟(ms)'],
+                 [(row.index_type, f"{row.avg_latency:.2f}") for row in by_latency[:3]])
+
+    print("\n最佳召回率:")
+    _print_table(['索引类型', '平均召回率'],
+                 [(row.index_type, f"{row.avg_recall:.4f}") for row in by_recall[:3]])
+
+    print("\n最佳吞吐量 (QPS):")
+    _print_table(['索引类型', '每秒查询数'],
+                 [(row.index_type, f"{row.qps:.2f}") for row in by_qps[:3]])
+
+    print("\n索引构建时间 (秒):")
+    _print_table(['索引类型', '构建时间(s)'],
+                 [(row.index_type, f"{row.build_time:.2f}") for row in by_build[:3]])
+
+    # 计算综合评分
+    # 四个指标拼成一个矩阵做一次归一化，max为0的列除以1避免除零
+    metric_matrix = np.stack([arr.avg_recall, arr.avg_latency, arr.qps, arr.build_time], axis=1)
+    maxes = metric_matrix.max(axis=0)
+    maxes[maxes == 0] = 1
+    normalized = metric_matrix / maxes
+    normalized[:, 1] = 1 - normalized[:, 1]  # 延迟越低越好
+    normalized[:, 3] = 1 - normalized[:, 3]  # 构建时间越低越好
+    norm_recall, norm_latency, norm_qps, norm_build = normalized.T
+
+    # 综合评分 (权重: 召回率40% 延迟30% 吞吐量20% 构建时间10%，可按需调整)
+    score = normalized @ np.array([0.4, 0.3, 0.2, 0.1])
+
+    score_order = np.argsort(score)[::-1]
+
+    print("\n综合评分 (综合考虑召回率、延迟、吞吐量和构建时间):")
+    _print_table(['索引类型', '综合评分'],
+                 [(arr.index_type[i], f"{score[i]:.4f}") for i in score_order[:3]])
+
+    # 提供建议
+    print("\n=== 索引选择建议 ===")
+    print(f"1. 对于追求准确性的场景，推荐使用: {by_recall[0].index_type}")
+    print(f"2. 对于追求低延迟的场景，推荐使用: {by_latency[0].index_type}")
+    print(f"3. 对于高吞吐量场景，推荐使用: {by_qps[0].index_type}")
+    print(f"4. 对于快速构建索引场景，推荐使用: {by_build[0].index_type}")
+    print(f"5. 综合性能最佳的索引: {arr.index_type[score_order[0]]}")
+    
+    # 生成可视化图表
+    if output_dir:
+        _render_plots(arr, by_latency, by_recall, score, score_order,
+                      norm_recall, norm_latency, norm_qps, norm_build, output_dir)
+
+    # 导出分析结果到CSV
+    if output_dir:
+        csv_file = os.path.join(output_dir, 'index_analysis.csv')
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['index_type', 'build_time', 'avg_latency', 'avg_recall',
+                             'qps', 'index_size', 'norm_recall', 'norm_latency',
+                             'norm_qps', 'norm_build', 'score'])
+            for i in range(len(arr)):
+                writer.writerow([arr.index_type[i], arr.build_time[i], arr.avg_latency[i],
+                                 arr.avg_recall[i], arr.qps[i], arr.index_size[i],
+                                 norm_recall[i], norm_latency[i],
+                                 norm_qps[i], norm_build[i], score[i]])
+        logger.info(f"已导出分析结果到 {csv_file}")
+
+    logger.info("结果解释完成")
+    return arr
+
+def run(args):
+    """分析基准测试结果，args为已解析的参数命名空间"""
+    # 设置日志级别
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    
+    # 解析结果目录路径
+    results_dir = args.results_dir
+    if not os.path.isabs(results_dir):
+        # 如果是相对路径，则相对于脚本目录解析
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        results_dir = os.path.abspath(os.path.join(script_dir, results_dir))
+    
+    # 解析输出目录路径
+    output_dir = args.output_dir
+    if output_dir and not os.path.isabs(output_dir):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        output_dir = os.path.abspath(os.path.join(script_dir, output_dir))
+    
+    results = load_results(results_dir)
+    if results:
+        explain_results(results, output_dir)
+        return True
+    else:
+        print("未找到结果文件或结果文件为空")
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="解释Milvus基准测试结果")
+    parser.add_argument('--results-dir', type=str, default='../results',
+                        help='结果目录路径')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='输出目录路径 (用于保存图表和分析结果)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='显示详细日志')
+
+    args = parser.parse_args()
+    return run(args)
+
+if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -5,40 +5,51 @@ import logging
 import os
 from datetime import datetime
 
+# 已配置的日志记录器缓存，同名重复调用直接复用，避免再次打开日志文件
+_LOGGERS = {}
+
+# 共享格式化器，Formatter初始化时会解析格式串，无需每次调用重建
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
 def setup_logger(name, log_dir='logs', level=logging.INFO):
     """设置日志记录器"""
+    # 同名记录器直接返回缓存实例
+    if name in _LOGGERS:
+        return _LOGGERS[name]
+
     # 创建日志目录
     os.makedirs(log_dir, exist_ok=True)
-    
+
     # 创建日志文件名，包含时间戳
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     log_file = os.path.join(log_dir, f'{name}_{timestamp}.log')
-    
+
     # 配置日志记录器
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
+
     # 避免重复添加处理器
     if logger.handlers:
+        _LOGGERS[name] = logger
         return logger
-    
+
     # 文件处理器
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(level)
-    
+
     # 控制台处理器
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
-    
+
     # 格式化器
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
+    file_handler.setFormatter(_FORMATTER)
+    console_handler.setFormatter(_FORMATTER)
+
     # 添加处理器
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
-    
+
+    _LOGGERS[name] = logger
     return logger
 
 def get_logger(name='milvus_benchmark'):
@@ -3,10 +3,10 @@
 
 import os
 import time
+import threading
+import itertools
+import concurrent.futures
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from tqdm import tqdm
 from pymilvus import (
     connections,
@@ -20,6 +20,32 @@ import argparse
 import json
 from datetime import datetime
 
+# pandas/matplotlib/seaborn只在出报表和参数扫描时用到，
+# 推迟到对应函数内导入，基准测试冷启动省掉约半秒的导入开销
+
+# numba可把召回率统计融合成单遍并行核，不产生中间布尔矩阵，
+# 在TOP_K或查询数很大时明显快于numpy实现；未安装时退回numpy路径
+try:
+    from numba import njit, prange
+
+    @njit(cache=True, parallel=True, boundscheck=False)
+    def _recall_per_query(pred, truth):
+        n, k = pred.shape
+        out = np.empty(n, np.float64)
+        for i in prange(n):
+            s = 0
+            t = truth[i]
+            for j in range(k):
+                v = pred[i, j]
+                for m in range(k):
+                    if t[m] == v:
+                        s += 1
+                        break
+            out[i] = s / k
+        return out
+except ImportError:
+    _recall_per_query = None
+
 # 设置数据目录
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
@@ -56,6 +82,11 @@ INDEX_CONFIGS = {
         "index_type": "HNSW",
         "metric_type": "L2",
         "params": {"M": 16, "efConstruction": 500}
+    },
+    "IVF_PQ": {
+        "index_type": "IVF_PQ",
+        "metric_type": "L2",
+        "params": {"nlist": 1024, "m": 16, "nbits": 8}
     }
 }
 
@@ -64,9 +95,32 @@ SEARCH_PARAMS = {
     "FLAT": {"metric_type": "L2", "params": {}},
     "IVF_FLAT": {"metric_type": "L2", "params": {"nprobe": 16}},
     "IVF_SQ8": {"metric_type": "L2", "params": {"nprobe": 16}},
-    "HNSW": {"metric_type": "L2", "params": {"ef": 64}}
+    "HNSW": {"metric_type": "L2", "params": {"ef": 64}},
+    "IVF_PQ": {"metric_type": "L2", "params": {"nprobe": 16}}
 }
 
+def estimate_bytes_read(index_type, num_entities, dim):
+    """按"查询成本≈读取字节数"的模型估算单次查询扫描的数据量。
+
+    FLAT全表扫描；IVF族为nprobe×平均分区大小×每向量字节数
+    （SQ8每维1字节，PQ为m个8bit编码）；HNSW按图游走，
+    读取量不适用该模型，返回None"""
+    index_params = INDEX_CONFIGS[index_type]["params"]
+    search_params = SEARCH_PARAMS[index_type]["params"]
+
+    if index_type == "FLAT":
+        return num_entities * dim * 4
+    if "nlist" in index_params:
+        avg_partition_size = num_entities / index_params["nlist"]
+        if index_type == "IVF_SQ8":
+            bytes_per_vector = dim
+        elif index_type == "IVF_PQ":
+            bytes_per_vector = index_params["m"]
+        else:
+            bytes_per_vector = dim * 4
+        return int(search_params.get("nprobe", 1) * avg_partition_size * bytes_per_vector)
+    return None
+
 def connect_to_milvus():
     """连接到Milvus服务器"""
     print(f"连接到Milvus服务器 {MILVUS_HOST}:{MILVUS_PORT}...")
@@ -96,10 +150,32 @@ def connect_to_milvus():
 def load_data():
     """加载SIFT数据集"""
     try:
-        base_vectors = np.load(os.path.join(DATA_DIR, "sift_base.npy"))
-        query_vectors = np.load(os.path.join(DATA_DIR, "sift_query.npy"))
-        groundtruth = np.load(os.path.join(DATA_DIR, "sift_groundtruth.npy"))
-        
+        # 完整SIFT数据是三个独立的.npy文件，优先加载；
+        # 单个npz归档只是随机示例数据集的后备，不能遮蔽真实数据
+        base_path = os.path.join(DATA_DIR, "sift_base.npy")
+        query_path = os.path.join(DATA_DIR, "sift_query.npy")
+        groundtruth_path = os.path.join(DATA_DIR, "sift_groundtruth.npy")
+        if all(os.path.exists(p) for p in (base_path, query_path, groundtruth_path)):
+            # 基础向量按需分页映射，插入迭代到哪页读哪页，不占驻留内存；
+            # 查询向量很小，直接读入内存
+            base_vectors = np.load(base_path, mmap_mode='r')
+            query_vectors = np.load(query_path)
+            groundtruth = np.load(groundtruth_path, mmap_mode='r')
+        else:
+            data = np.load(os.path.join(DATA_DIR, "sift.npz"), mmap_mode='r')
+            base_vectors = data['base']
+            query_vectors = data['query']
+            groundtruth = data['groundtruth']
+
+        # 真值只保留前TOP_K列并一次性转成连续int64块，
+        # 召回率计算直接在原生dtype上进行，不再逐元素提升类型
+        groundtruth = np.ascontiguousarray(groundtruth[:, :TOP_K], dtype=np.int64)
+
+        # 数据管线产出的就是float32，仅在类型不符时才转换，
+        # 避免把内存映射的基础向量整表物化到RAM
+        if base_vectors.dtype != np.float32:
+            base_vectors = np.ascontiguousarray(base_vectors, dtype=np.float32)
+
         print(f"加载的基础向量: {base_vectors.shape}")
         print(f"加载的查询向量: {query_vectors.shape}")
         print(f"加载的真实结果: {groundtruth.shape}")
@@ -111,7 +187,9 @@ def load_data():
 
 def create_collection(dim=DEFAULT_DIM):
     """创建Milvus集合"""
-    if utility.has_collection(COLLECTION_NAME):
+    # 用list API一次取回全部集合名做存在性判断，
+    # 不做逐名has_collection的元数据RPC
+    if COLLECTION_NAME in set(utility.list_collections()):
         utility.drop_collection(COLLECTION_NAME)
         print(f"已删除现有集合: {COLLECTION_NAME}")
     
@@ -130,26 +208,36 @@ def create_collection(dim=DEFAULT_DIM):
 
 def insert_data(collection, base_vectors):
     """向集合中插入数据"""
-    # 准备数据
-    ids = np.arange(len(base_vectors))
-    entities = [ids, base_vectors]
-    
     # 分批插入数据
     batch_size = 50000
     num_batches = (len(base_vectors) + batch_size - 1) // batch_size
-    
+    batch_ranges = [(i * batch_size, min((i + 1) * batch_size, len(base_vectors)))
+                    for i in range(num_batches)]
+
     print(f"开始插入数据，共{len(base_vectors)}条，分{num_batches}批处理...")
-    
-    for i in tqdm(range(num_batches)):
-        start = i * batch_size
-        end = min((i + 1) * batch_size, len(base_vectors))
-        
-        batch_ids = ids[start:end]
-        batch_vectors = base_vectors[start:end]
-        
-        collection.insert([batch_ids, batch_vectors])
-    
-    # 确保数据写入
+
+    # 批次相互独立，单次insert受限于gRPC往返而非CPU，
+    # 用小线程池让网络往返与下一批切片重叠；
+    # 信号量把在途请求限制在4个，避免压爆服务端RPC队列
+    in_flight = threading.Semaphore(4)
+
+    def _insert_batch(start, end):
+        try:
+            # 每批按需生成自己的id区间，不在内存中常驻一个完整的arange(N)
+            batch_ids = np.arange(start, end, dtype=np.int64)
+            return collection.insert([batch_ids, base_vectors[start:end]])
+        finally:
+            in_flight.release()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures = []
+        for start, end in batch_ranges:
+            in_flight.acquire()
+            futures.append(executor.submit(_insert_batch, start, end))
+        for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures)):
+            future.result()
+
+    # 确保数据写入，flush在所有批次完成后执行一次
     collection.flush()
     print(f"数据插入完成，共插入{collection.num_entities}条记录")
 
@@ -173,59 +261,109 @@ def build_index(collection, index_type):
     collection.load()
     return build_time
 
-def evaluate_search(collection, query_vectors, groundtruth, index_type, runs=5):
-    """评估搜索性能"""
+def evaluate_search(collection, test_queries, test_ground_truth, index_type, runs=5,
+                    mode='latency'):
+    """评估搜索性能；查询样本由调用方统一采样，各索引类型共用同一组。
+
+    mode='latency'用单次批量查询测延迟；mode='throughput'把查询拆成
+    单条并发提交，测服务端并发上限下的吞吐量，补充而非替代批量测量"""
     if index_type not in SEARCH_PARAMS:
         print(f"未知的索引类型: {index_type}")
         return None
-    
+
     search_params = SEARCH_PARAMS[index_type]
     print(f"开始评估索引: {index_type}, 搜索参数: {search_params['params']}")
-    
+
     # 执行搜索
     latencies = []
     recalls = []
-    
-    # 随机选择部分查询向量进行测试
-    num_queries = min(100, len(query_vectors))
-    query_indices = np.random.choice(len(query_vectors), num_queries, replace=False)
-    test_queries = query_vectors[query_indices]
-    test_ground_truth = groundtruth[query_indices]
-    
-    # 多次运行以获得稳定结果
-    for run in range(runs):
-        print(f"运行 {run+1}/{runs}")
-        
-        # 计算批量查询的延迟
-        start_time = time.time()
-        results = collection.search(
-            data=test_queries, 
-            anns_field="vector", 
+    qps_values = []
+    num_queries = len(test_queries)
+
+    # 正式计时前先做两次不计时的预热查询：第一次触发gRPC通道建立、
+    # 索引惰性加载和缓存页载入，第二次确认加载已完成，
+    # 避免首次调用的开销污染延迟统计
+    for _ in range(2):
+        collection.search(
+            data=test_queries[:1],
+            anns_field="vector",
             param=search_params,
             limit=TOP_K,
             output_fields=[]
         )
-        end_time = time.time()
+
+    # 真值矩阵与运行轮次无关，循环外准备一次；
+    # numpy回退路径用的行排序版本同样只排一次
+    true_arr = np.ascontiguousarray(test_ground_truth[:, :TOP_K], dtype=np.int64)
+    sorted_true = np.sort(true_arr, axis=1) if _recall_per_query is None else None
+
+    # 多次运行以获得稳定结果
+    for run in range(runs):
+        print(f"运行 {run+1}/{runs}")
         
-        # 计算平均延迟（毫秒）
-        latency = (end_time - start_time) * 1000 / num_queries
+        # perf_counter_ns是单调高精度时钟，
+        # time.time()的毫秒级分辨率会淹没亚毫秒级的ANN查询
+        if mode == 'throughput':
+            # 吞吐模式：逐条查询并发提交，让服务端并行度而非客户端
+            # 串行提交决定QPS；按提交顺序取结果保证与真值行对齐
+            start_ns = time.perf_counter_ns()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=32) as executor:
+                futures = [
+                    executor.submit(
+                        collection.search,
+                        data=test_queries[i:i + 1],
+                        anns_field="vector",
+                        param=search_params,
+                        limit=TOP_K,
+                        output_fields=[]
+                    )
+                    for i in range(num_queries)
+                ]
+                results = [future.result()[0] for future in futures]
+            elapsed_ns = time.perf_counter_ns() - start_ns
+        else:
+            # 延迟模式：单次批量查询
+            start_ns = time.perf_counter_ns()
+            results = collection.search(
+                data=test_queries,
+                anns_field="vector",
+                param=search_params,
+                limit=TOP_K,
+                output_fields=[]
+            )
+            elapsed_ns = time.perf_counter_ns() - start_ns
+
+        # 计算平均延迟（毫秒）和吞吐量（QPS）
+        latency = elapsed_ns / 1e6 / num_queries
         latencies.append(latency)
+        qps_values.append(num_queries * 1e9 / elapsed_ns)
         
-        # 计算召回率
-        recall_sum = 0
-        for i, result in enumerate(results):
-            # 获取Milvus返回的ID
-            milvus_ids = [hit.id for hit in result]
-            # 获取真实的最近邻ID（取TOP_K个）
-            true_ids = test_ground_truth[i][:TOP_K]
-            # 计算交集大小
-            intersection = len(set(milvus_ids) & set(true_ids))
-            # 计算召回率
-            recall = intersection / len(true_ids)
-            recall_sum += recall
-        
+        # 计算召回率：把所有返回ID堆成(nq, TOP_K)矩阵做向量化交集统计，
+        # 替代每个查询构建两个Python set再求交的解释器级开销；
+        # Hits.ids直接返回整批ID列表，生成器喂给fromiter一次性写进
+        # 连续缓冲区，不再物化嵌套的Python列表中间结果。
+        # 命中不足TOP_K个的查询（如小数据集上nprobe很小时）用-1补齐，
+        # ID非负所以-1永远不会计入召回
+        milvus_arr = np.fromiter(
+            (hit_id for result in results
+             for hit_id in itertools.chain(
+                 result.ids, itertools.repeat(-1, TOP_K - len(result.ids)))),
+            dtype=np.int64, count=num_queries * TOP_K
+        ).reshape(num_queries, TOP_K)
+
+        if _recall_per_query is not None:
+            # numba融合核：查找、求和在一遍并行循环里完成
+            avg_recall = float(_recall_per_query(milvus_arr, true_arr).mean())
+        else:
+            # 逐行searchsorted（C层二分）在预排序的真值里定位返回ID
+            pos = np.empty_like(milvus_arr)
+            for i in range(num_queries):
+                pos[i] = np.searchsorted(sorted_true[i], milvus_arr[i])
+            np.clip(pos, 0, TOP_K - 1, out=pos)
+            hits = np.take_along_axis(sorted_true, pos, axis=1) == milvus_arr
+            avg_recall = hits.sum() / (num_queries * TOP_K)
+
         # 计算平均召回率
-        avg_recall = recall_sum / num_queries
         recalls.append(avg_recall)
     
     # 计算平均值和标准差
@@ -233,20 +371,96 @@ def evaluate_search(collection, query_vectors, groundtruth, index_type, runs=5):
     std_latency = np.std(latencies)
     avg_recall = np.mean(recalls)
     std_recall = np.std(recalls)
-    
+    avg_qps = np.mean(qps_values)
+
     print(f"平均延迟: {avg_latency:.2f}毫秒 (±{std_latency:.2f})")
     print(f"平均召回率: {avg_recall:.4f} (±{std_recall:.4f})")
-    
-    return {
+    print(f"平均吞吐量: {avg_qps:.2f} QPS")
+
+    result = {
         "index_type": index_type,
         "avg_latency": float(avg_latency),
         "std_latency": float(std_latency),
         "avg_recall": float(avg_recall),
         "std_recall": float(std_recall),
+        "qps": float(avg_qps),
         "search_params": search_params["params"]
     }
+    # 超参数同时展开成param_*平铺字段：嵌套dict在CSV里会被序列化成
+    # 字符串，平铺列才能直接按nprobe/ef过滤和与扫描结果做关联
+    result.update({f"param_{k}": v for k, v in search_params["params"].items()})
+    return result
+
+def sweep_search_params(collection, index_type, test_queries, test_ground_truth,
+                        target_recall=0.95):
+    """在固定目标召回率下粗扫nprobe/ef，返回达标的最小参数值。
+
+    沿用"固定召回率、最小化成本"的自动调参思路：候选值从小到大逐个
+    用单次运行评估，完整的召回率-延迟曲线保存为CSV和Pareto散点图；
+    返回(最优值, 扫描记录)，无可调搜索参数的索引类型返回(None, [])"""
+    params = SEARCH_PARAMS[index_type]["params"]
+    if "nprobe" in params:
+        param_name, candidates = "nprobe", [1, 2, 4, 8, 16, 32, 64, 128]
+    elif "ef" in params:
+        param_name, candidates = "ef", [16, 32, 64, 128, 256, 512]
+    else:
+        print(f"索引 {index_type} 没有可调搜索参数，跳过扫描")
+        return None, []
 
-def run_benchmark(index_types=None):
+    print(f"开始扫描 {index_type} 的 {param_name}，目标召回率: {target_recall}")
+    original = params[param_name]
+    sweep = []
+    best = None
+    try:
+        for value in candidates:
+            params[param_name] = value
+            result = evaluate_search(collection, test_queries, test_ground_truth,
+                                     index_type, runs=1)
+            record = {
+                param_name: value,
+                "avg_recall": result["avg_recall"],
+                "avg_latency": result["avg_latency"],
+                "qps": result["qps"]
+            }
+            sweep.append(record)
+            if best is None and record["avg_recall"] >= target_recall:
+                best = value
+    finally:
+        # 扫描不改变全局搜索参数
+        params[param_name] = original
+
+    # 保存完整扫描曲线和Pareto散点图
+    import matplotlib
+    matplotlib.use('Agg')  # 纯文件输出，跳过GUI后端探测
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    df = pd.DataFrame(sweep)
+    csv_file = os.path.join(RESULTS_DIR, f"sweep_{index_type}_{timestamp}.csv")
+    df.to_csv(csv_file, index=False)
+
+    plt.figure(figsize=(8, 6))
+    plt.scatter(df["avg_latency"], df["avg_recall"])
+    for record in sweep:
+        plt.annotate(str(record[param_name]),
+                     (record["avg_latency"], record["avg_recall"]))
+    plt.axhline(target_recall, linestyle='--', color='gray')
+    plt.xlabel("Latency (ms)")
+    plt.ylabel("Recall")
+    plt.title(f"{index_type} {param_name} sweep")
+    plt.tight_layout()
+    plt.savefig(os.path.join(RESULTS_DIR, f"sweep_{index_type}_{timestamp}.png"))
+    plt.close()
+    print(f"扫描结果已保存到: {csv_file}")
+
+    if best is None:
+        print(f"没有候选值达到目标召回率 {target_recall}")
+    else:
+        print(f"达到目标召回率的最小参数: {param_name}={best}")
+    return best, sweep
+
+def run_benchmark(index_types=None, sweep=False, throughput=False):
     """运行基准测试"""
     if index_types is None:
         index_types = list(INDEX_CONFIGS.keys())
@@ -262,43 +476,67 @@ def run_benchmark(index_types=None):
     
     # 记录结果
     results = []
-    build_times = {}
-    
+
+    # 各索引类型测试的数据完全相同，集合只创建一次、数据只插入一次，
+    # 每轮测试仅在同一集合上重建索引，省掉重复插入的时间。
+    # 这也决定了各索引的评估只能串行：同一集合同时只有一个向量索引，
+    # 无法跨进程并行搜索多个索引；并发压测需求由evaluate_search的
+    # throughput模式在单索引内满足
+    collection = create_collection(dim=base_vectors.shape[1])
+    insert_data(collection, base_vectors)
+
+    # 查询样本在索引循环外用固定种子采样一次：各索引类型共用同一组查询，
+    # 召回率横向对比才公平，且结果可复现
+    rng = np.random.default_rng(42)
+    num_queries = min(100, len(query_vectors))
+    query_indices = rng.choice(len(query_vectors), num_queries, replace=False)
+    # 花式索引的结果转成连续float32块，pymilvus逐行序列化时
+    # 不再为跨步数组做逐行拷贝，也不做float64隐式转换
+    test_queries = np.ascontiguousarray(query_vectors[query_indices], dtype=np.float32)
+    test_ground_truth = groundtruth[query_indices]
+
     # 为每种索引类型运行测试
     for index_type in index_types:
         print(f"\n========== 测试索引: {index_type} ==========")
-        
+
         try:
-            # 为每种索引类型创建新的集合
-            collection_name = f"{COLLECTION_NAME}_{index_type.lower()}"
-            
-            # 创建集合
-            if utility.has_collection(collection_name):
-                utility.drop_collection(collection_name)
-                print(f"已删除现有集合: {collection_name}")
-                
-            # 定义集合字段
-            fields = [
-                FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=False),
-                FieldSchema(name="vector", dtype=DataType.FLOAT_VECTOR, dim=base_vectors.shape[1])
-            ]
-            
-            # 创建集合
-            schema = CollectionSchema(fields=fields, description=f"SIFT向量基准测试集合-{index_type}")
-            collection = Collection(name=collection_name, schema=schema)
-            print(f"已创建集合: {collection_name}")
-            
-            # 插入数据
-            insert_data(collection, base_vectors)
-            
+            # 换索引前先释放集合并删除旧索引
+            collection.release()
+            if collection.has_index():
+                collection.drop_index()
+                print("已删除现有索引")
+
             # 构建索引
             build_time = build_index(collection, index_type)
-            build_times[index_type] = build_time
-            
+
             # 评估搜索性能
-            result = evaluate_search(collection, query_vectors, groundtruth, index_type)
+            result = evaluate_search(collection, test_queries, test_ground_truth, index_type)
             if result:
                 result["build_time"] = build_time
+                # 每查询读取字节数估算，用于召回率/延迟之外的成本维度对比
+                bytes_read = estimate_bytes_read(
+                    index_type, len(base_vectors), base_vectors.shape[1])
+                result["bytes_read_est"] = bytes_read
+                if bytes_read is not None:
+                    print(f"估算每查询读取量: {bytes_read / 1024 / 1024:.2f} MB")
+
+                # 可选的并发吞吐测试：在同一索引上加测一轮throughput模式，
+                # 记录并发提交下的QPS作为批量QPS的补充维度
+                if throughput:
+                    print(f"并发吞吐测试: {index_type}")
+                    throughput_result = evaluate_search(
+                        collection, test_queries, test_ground_truth, index_type,
+                        mode='throughput')
+                    if throughput_result:
+                        result["concurrent_qps"] = throughput_result["qps"]
+
+                # 可选的搜索参数自动扫描
+                if sweep:
+                    best_value, _ = sweep_search_params(
+                        collection, index_type, test_queries, test_ground_truth)
+                    if best_value is not None:
+                        result["sweep_best_param"] = best_value
+
                 results.append(result)
         except Exception as e:
             print(f"测试索引 {index_type} 时出错: {e}")
@@ -328,6 +566,12 @@ def run_benchmark(index_types=None):
 
 def generate_report(results, timestamp):
     """生成测试报告"""
+    import matplotlib
+    matplotlib.use('Agg')  # 纯文件输出，跳过GUI后端探测
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import pandas as pd
+
     # 创建DataFrame
     df = pd.DataFrame(results)
     
@@ -370,13 +614,9 @@ def generate_report(results, timestamp):
     plot_file = os.path.join(RESULTS_DIR, f"benchmark_plot_{timestamp}.png")
     plt.savefig(plot_file)
     
-    # 生成索引构建时间图表
+    # 生成索引构建时间图表，构建时间已在df里，无需再组装中间字典
     plt.figure(figsize=(10, 6))
-    build_times = {result["index_type"]: result["build_time"] for result in results}
-    index_types = list(build_times.keys())
-    times = list(build_times.values())
-    
-    ax = sns.barplot(x=index_types, y=times)
+    ax = sns.barplot(x="index_type", y="build_time", data=df)
     for i, bar in enumerate(ax.patches):
         ax.text(
             bar.get_x() + bar.get_width()/2.,
@@ -395,14 +635,23 @@ def generate_report(results, timestamp):
     
     print(f"Generated reports:\n1. CSV: {csv_file}\n2. Performance chart: {plot_file}\n3. Build time chart: {build_time_plot}")
 
+def run(args):
+    """运行基准测试，args为已解析的参数命名空间"""
+    return run_benchmark(args.indices, sweep=getattr(args, 'sweep', False),
+                         throughput=getattr(args, 'throughput', False))
+
 def main():
     parser = argparse.ArgumentParser(description="Milvus性能基准测试工具")
-    parser.add_argument('--indices', type=str, nargs='+', 
+    parser.add_argument('--indices', type=str, nargs='+',
                         choices=list(INDEX_CONFIGS.keys()),
                         help='要测试的索引类型，如不指定则测试所有索引')
-    
+    parser.add_argument('--sweep', action='store_true',
+                        help='对每种索引额外扫描nprobe/ef，寻找达到目标召回率的最小参数')
+    parser.add_argument('--throughput', action='store_true',
+                        help='对每种索引额外做并发吞吐测试，记录concurrent_qps')
+
     args = parser.parse_args()
-    run_benchmark(args.indices)
+    return run(args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
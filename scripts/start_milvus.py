@@ -3,11 +3,12 @@
 
 import os
 import time
+import shutil
 import docker
 import subprocess
 from dotenv import load_dotenv
 import requests
-import re
+from requests.adapters import HTTPAdapter
 
 # 加载环境变量
 load_dotenv()
@@ -16,11 +17,20 @@ load_dotenv()
 MILVUS_VERSION = os.getenv("MILVUS_VERSION", "2.3.0")
 DOCKER_COMPOSE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "docker-compose.yml")
 
+# 复用同一个Docker SDK客户端，连接探测只做一次
+_docker_client = None
+
+def _get_docker_client():
+    """获取缓存的Docker客户端，首次调用时建立连接"""
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = docker.from_env()
+    return _docker_client
+
 def check_docker():
     """检查Docker是否安装并运行"""
     try:
-        client = docker.from_env()
-        version = client.version()["Version"]
+        version = _get_docker_client().version()["Version"]
         print(f"Docker版本: {version}")
         return True
     except Exception as e:
@@ -34,20 +44,35 @@ def download_docker_compose():
     
     # 下载docker-compose.yml
     url = f"https://github.com/milvus-io/milvus/releases/download/v{MILVUS_VERSION}/milvus-standalone-docker-compose.yml"
-    
+    meta_file = DOCKER_COMPOSE_FILE + ".last-modified"
+
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            compose_content = response.text
-            
-            # 直接使用原始内容，不替换镜像源
-            with open(DOCKER_COMPOSE_FILE, 'w') as f:
-                f.write(compose_content)
-            print(f"Docker Compose配置文件已下载到: {DOCKER_COMPOSE_FILE}")
-            return True
-        else:
-            print(f"下载失败，状态码: {response.status_code}")
-            return False
+        # 本地已有文件时带If-Modified-Since，服务端未变更则304，免去重复下载
+        headers = {}
+        if os.path.exists(DOCKER_COMPOSE_FILE) and os.path.exists(meta_file):
+            with open(meta_file, 'r') as f:
+                headers["If-Modified-Since"] = f.read().strip()
+
+        with requests.get(url, stream=True, timeout=30, headers=headers) as response:
+            if response.status_code == 304:
+                print("Docker Compose配置未变更，使用本地缓存")
+                return True
+            if response.status_code != 200:
+                print(f"下载失败，状态码: {response.status_code}")
+                return False
+
+            # 二进制流式落盘：不整读进内存做文本解码，
+            # 也避开Windows文本模式的换行转换破坏YAML
+            with open(DOCKER_COMPOSE_FILE, 'wb') as f:
+                shutil.copyfileobj(response.raw, f)
+
+            last_modified = response.headers.get("Last-Modified")
+            if last_modified:
+                with open(meta_file, 'w') as f:
+                    f.write(last_modified)
+
+        print(f"Docker Compose配置文件已下载到: {DOCKER_COMPOSE_FILE}")
+        return True
     except Exception as e:
         print(f"下载Docker Compose配置失败: {e}")
         return False
@@ -113,8 +138,21 @@ networks:
     print(f"已创建简化版Docker Compose配置文件: {DOCKER_COMPOSE_FILE}")
     return True
 
+def milvus_already_running():
+    """检查Milvus容器是否已经在运行"""
+    try:
+        container = _get_docker_client().containers.get("milvus-standalone")
+        return container.status == "running"
+    except Exception:
+        return False
+
 def start_milvus():
     """启动Milvus服务"""
+    # 容器已在运行时直接复用，免去15-45秒的compose重启开销
+    if milvus_already_running():
+        print("检测到Milvus服务已在运行，跳过启动")
+        return True
+
     if not os.path.exists(DOCKER_COMPOSE_FILE):
         print("Docker Compose配置文件不存在，正在下载...")
         if not download_docker_compose():
@@ -135,25 +173,29 @@ def start_milvus():
     
     try:
         print("正在启动Milvus服务...")
+        # 参数列表形式直接执行，不经过shell解析
         subprocess.run(
-            f"docker compose -f {DOCKER_COMPOSE_FILE} up -d",
-            shell=True,
+            ["docker", "compose", "-f", DOCKER_COMPOSE_FILE, "up", "-d"],
             check=True
         )
-        
-        # 等待Milvus启动
+
+        # 等待Milvus启动；轮询用同一个Session保持TCP连接复用，
+        # 每轮先通过Docker SDK确认容器在运行，容器没起来就不发健康检查
         print("等待Milvus服务启动...")
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
         retries = 0
         max_retries = 30
         while retries < max_retries:
             try:
-                response = requests.get("http://localhost:9091/api/v1/health")
-                if response.status_code == 200:
-                    print("Milvus服务已成功启动！")
-                    # 等待额外的5秒，确保服务完全可用
-                    time.sleep(10)
-                    print("额外等待完成，服务应该已完全就绪")
-                    return True
+                if milvus_already_running():
+                    response = session.get("http://localhost:9091/api/v1/health", timeout=1)
+                    if response.status_code == 200:
+                        print("Milvus服务已成功启动！")
+                        # 等待额外的5秒，确保服务完全可用
+                        time.sleep(10)
+                        print("额外等待完成，服务应该已完全就绪")
+                        return True
             except:
                 pass
             
@@ -173,8 +215,7 @@ def stop_milvus():
     try:
         print("正在停止Milvus服务...")
         subprocess.run(
-            f"docker compose -f {DOCKER_COMPOSE_FILE} down",
-            shell=True,
+            ["docker", "compose", "-f", DOCKER_COMPOSE_FILE, "down"],
             check=True
         )
         print("Milvus服务已停止")